@@ -0,0 +1,97 @@
+"""
+Batched event writer.
+
+Queues new event rows from start_event and flushes them to the database
+from a background task as multi-row INSERTs.
+
+Rows take started_at from now() in the flush transaction, so every event in
+a batch shares one timestamp, up to event_batch_window_ms after its request.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import insert
+
+from .config import settings
+from .database import SessionLocal
+from .models import Event
+
+logger = logging.getLogger(__name__)
+
+
+class EventWriter:
+    """Background task that coalesces event inserts into batches."""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the background flush task."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush any queued rows and stop the background task."""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    def enqueue(self, row: dict):
+        """
+        Queue an event row for insertion.
+
+        Args:
+            row: Event column values, including a client-generated "id"
+        """
+        self._queue.put_nowait(row)
+
+    async def _run(self):
+        """Drain the queue in batches until stopped."""
+        loop = asyncio.get_running_loop()
+        window = settings.event_batch_window_ms / 1000
+        running = True
+
+        while running:
+            row = await self._queue.get()
+            if row is None:
+                break
+
+            rows = [row]
+            deadline = loop.time() + window
+            while len(rows) < settings.event_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    running = False
+                    break
+                rows.append(row)
+
+            await self._write(rows)
+
+    async def _write(self, rows: list[dict]):
+        """Insert a batch of rows."""
+        try:
+            async with SessionLocal() as db:
+                await db.execute(insert(Event), rows)
+                await db.commit()
+        except Exception:
+            # Snapshots in object storage remain the source of truth; the IDs
+            # match their snapshots/<id>.jpg object names for recovery
+            logger.exception(
+                "Failed to write %d events: %s",
+                len(rows), ", ".join(str(row["id"]) for row in rows)
+            )
+
+
+# Global event writer instance
+event_writer = EventWriter()
@@ -9,6 +9,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .database import init_db
+from .event_writer import event_writer
 from .storage import storage
 from .routers import events
 
@@ -20,7 +21,10 @@ async def lifespan(app: FastAPI):
     print("[API] Starting up...")
     
     # Initialize database tables
-    init_db()
+    await init_db()
+    
+    # Start the batched event writer
+    await event_writer.start()
     
     # Ensure MinIO bucket exists
     try:
@@ -33,6 +37,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("[API] Shutting down...")
+    await event_writer.stop()
 
 
 # Create FastAPI application
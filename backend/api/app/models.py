@@ -3,8 +3,7 @@ SQLAlchemy database models.
 """
 
 import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -17,11 +16,18 @@ class Device(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
     api_key_hash = Column(String(255), nullable=True)  # Optional for now
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # default= renders now() into the API's own INSERTs, so rows get a timestamp
+    # even on a table from before migration 0002 added the server default
+    created_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now(), nullable=False)
 
     # Relationships
     events = relationship("Event", back_populates="device")
 
+    __table_args__ = (
+        # Conflict target for the default-device upsert in start_event
+        Index("ix_devices_name", name, unique=True),
+    )
+
     def __repr__(self):
         return f"<Device {self.name}>"
 
@@ -32,11 +38,17 @@ class Event(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     device_id = Column(UUID(as_uuid=True), ForeignKey("devices.id"), nullable=False)
-    started_at = Column(DateTime, default=datetime.utcnow)
+    # default= as for Device.created_at
+    started_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now(), nullable=False)
     snapshot_url = Column(Text, nullable=True)  # Filled on finalize
 
     # Relationships
     device = relationship("Device", back_populates="events")
 
+    __table_args__ = (
+        # list_events: ORDER BY started_at DESC LIMIT n
+        Index("ix_events_started_at", started_at.desc()),
+    )
+
     def __repr__(self):
         return f"<Event {self.id}>"
@@ -3,185 +3,311 @@ Events API router.
 
 Endpoints:
 - POST /v1/events/start - Start a new event, get presigned upload URL
+- POST /v1/events/ingest - Create an event with its snapshot (raw JPEG body) in one request
 - POST /v1/events/{event_id}/finalize - Finalize event with snapshot URL
+- POST /v1/events/{event_id}/upload-base64 - Upload snapshot as base64 JSON
+- POST /v1/events/{event_id}/upload-binary - Upload snapshot as raw JPEG body
 """
 
+import asyncio
+import binascii
 import uuid
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from sqlalchemy import bindparam, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 
+from ..config import settings
 from ..database import get_db
+from ..event_writer import event_writer
 from ..models import Device, Event
 from ..schemas import EventStartResponse, EventFinalizeRequest, EventFinalizeResponse, EventResponse
 from ..storage import storage
 
 router = APIRouter(prefix="/v1/events", tags=["events"])
 
+# Event point lookup, built once so its compiled form is reused from the statement cache
+_EVENT_BY_ID = select(Event).where(Event.id == bindparam("id"))
 
-@router.post("/start", response_model=EventStartResponse)
-def start_event(
-    device_id: Optional[str] = Query(None, description="Device ID (optional, uses default if not provided)"),
-    db: Session = Depends(get_db)
+# Extra lookups (with doubling delays, starting at one batch window) for an
+# event whose row may still be queued in a batch, possibly in another worker
+_LOOKUP_RETRIES = 3
+
+# Default device ID, resolved once per process (devices are never deleted)
+_DEFAULT_DEVICE_ID: Optional[uuid.UUID] = None
+
+
+async def get_default_device_id(db: AsyncSession) -> uuid.UUID:
+    """Get the default device ID, creating the device on first use."""
+    global _DEFAULT_DEVICE_ID
+    if _DEFAULT_DEVICE_ID is None:
+        upsert = pg_insert(Device).values(id=uuid.uuid4(), name="default")
+        try:
+            result = await db.execute(
+                upsert
+                .on_conflict_do_update(index_elements=[Device.name], set_={"name": upsert.excluded.name})
+                .returning(Device.id)
+            )
+            device_id = result.scalar_one()
+        except ProgrammingError:
+            # ON CONFLICT needs the unique ix_devices_name index (migration 0001);
+            # before `alembic upgrade head` has run, look the device up instead
+            await db.rollback()
+            device_id = await db.scalar(
+                select(Device.id).where(Device.name == "default").order_by(Device.created_at).limit(1)
+            )
+            if device_id is None:
+                device_id = uuid.uuid4()
+                db.add(Device(id=device_id, name="default"))
+        await db.commit()
+        _DEFAULT_DEVICE_ID = device_id
+    return _DEFAULT_DEVICE_ID
+
+
+async def _create_event(
+    db: AsyncSession,
+    event_id: uuid.UUID,
+    device_id: Optional[uuid.UUID],
+    snapshot_url: Optional[str] = None
 ):
     """
-    Start a new motion detection event.
+    Insert a new event for a device, or queue it for the default device.
     
-    Returns an event ID and a presigned URL for uploading the snapshot.
+    Raises:
+        HTTPException: 404 if device_id is given but doesn't exist
     """
-    # Get or create a default device if none specified
     if device_id:
-        try:
-            device_uuid = uuid.UUID(device_id)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid device_id format")
-        
-        device = db.query(Device).filter(Device.id == device_uuid).first()
-        if not device:
+        # Check the device and insert the event in a single statement (one round-trip)
+        device = select(Device.id).where(Device.id == device_id).cte("d")
+        result = await db.execute(
+            insert(Event)
+            .from_select(
+                ["id", "device_id", "snapshot_url"],
+                select(literal(event_id, Event.id.type), device.c.id, literal(snapshot_url, Event.snapshot_url.type))
+            )
+            .returning(Event.id)
+        )
+        if result.scalar_one_or_none() is None:
             raise HTTPException(status_code=404, detail="Device not found")
+        await db.commit()
     else:
-        # Use or create default device
-        device = db.query(Device).filter(Device.name == "default").first()
-        if not device:
-            device = Device(name="default")
-            db.add(device)
-            db.commit()
-            db.refresh(device)
+        # Default device: queue the insert, it is flushed in batches
+        event_writer.enqueue({
+            "id": event_id,
+            "device_id": await get_default_device_id(db),
+            "snapshot_url": snapshot_url
+        })
+
+
+async def _until_written(lookup):
+    """
+    Run an event lookup, retrying briefly while it finds nothing.
+    
+    Default-device events are inserted by the batched event writer, so a
+    request right after start/ingest can arrive before the row is committed.
+    
+    Args:
+        lookup: Coroutine function returning the row, or None if it's missing
+        
+    Returns:
+        The row, or None if it's still missing after the retries
+    """
+    delay = settings.event_batch_window_ms / 1000
+    for _ in range(_LOOKUP_RETRIES):
+        row = await lookup()
+        if row is not None:
+            return row
+        await asyncio.sleep(delay)
+        delay *= 2
+    return await lookup()
+
+
+async def _find_event(db: AsyncSession, event_id: uuid.UUID) -> Event:
+    """
+    Load an event by ID.
     
+    Raises:
+        HTTPException: 404 if the event doesn't exist
+    """
+    async def lookup():
+        result = await db.execute(_EVENT_BY_ID, {"id": event_id})
+        return result.scalar_one_or_none()
+    
+    event = await _until_written(lookup)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event
+
+
+@router.post("/start", response_model=EventStartResponse)
+async def start_event(
+    device_id: Optional[uuid.UUID] = Query(None, description="Device ID (optional, uses default if not provided)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Start a new motion detection event.
+    
+    Returns an event ID and a presigned URL for uploading the snapshot.
+    """
     # Create new event
-    event = Event(
-        device_id=device.id,
-        started_at=datetime.utcnow()
-    )
-    db.add(event)
-    db.commit()
-    db.refresh(event)
+    event_id = uuid.uuid4()
+    await _create_event(db, event_id, device_id)
     
     # Generate presigned upload URL
-    object_name = f"snapshots/{event.id}.jpg"
+    object_name = f"snapshots/{event_id}.jpg"
     upload_url = storage.generate_presigned_upload_url(object_name)
     
     return EventStartResponse(
-        event_id=event.id,
+        event_id=event_id,
         upload_url=upload_url
     )
 
 
 @router.post("/{event_id}/finalize", response_model=EventFinalizeResponse)
-def finalize_event(
-    event_id: str,
+async def finalize_event(
+    event_id: uuid.UUID,
     request: EventFinalizeRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Finalize an event after the snapshot has been uploaded.
     
     Updates the event with the snapshot URL.
     """
-    try:
-        event_uuid = uuid.UUID(event_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid event_id format")
+    # Update snapshot URL and check the event exists in one round-trip
+    async def set_snapshot_url():
+        result = await db.execute(
+            update(Event)
+            .where(Event.id == event_id)
+            .values(snapshot_url=request.snapshot_url)
+            .returning(Event.id, Event.snapshot_url)
+        )
+        return result.first()
     
-    event = db.query(Event).filter(Event.id == event_uuid).first()
-    if not event:
+    row = await _until_written(set_snapshot_url)
+    if row is None:
         raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Update snapshot URL
-    event.snapshot_url = request.snapshot_url
-    db.commit()
-    db.refresh(event)
+    await db.commit()
     
     return EventFinalizeResponse(
-        event_id=event.id,
+        event_id=row.id,
         status="finalized",
-        snapshot_url=event.snapshot_url
+        snapshot_url=row.snapshot_url
     )
 
 
 @router.get("/{event_id}", response_model=EventResponse)
-def get_event(
-    event_id: str,
-    db: Session = Depends(get_db)
+async def get_event(
+    event_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db)
 ):
     """Get an event by ID."""
-    try:
-        event_uuid = uuid.UUID(event_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid event_id format")
-    
-    event = db.query(Event).filter(Event.id == event_uuid).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    return event
+    return await _find_event(db, event_id)
 
 
 @router.get("/", response_model=list[EventResponse])
-def list_events(
+async def list_events(
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List recent events."""
-    events = db.query(Event).order_by(Event.started_at.desc()).limit(limit).all()
-    return events
+    result = await db.execute(select(Event).order_by(Event.started_at.desc()).limit(limit))
+    return result.scalars().all()
 
 
-# Base64 upload endpoint for NAT/firewall bypass
-from fastapi import Body
-import base64
-from io import BytesIO
+# Direct upload endpoints for NAT/firewall bypass
 
-@router.post("/{event_id}/upload-base64", response_model=EventFinalizeResponse)
-def upload_snapshot_base64(
-    event_id: str,
-    image_data: str = Body(..., embed=True),
-    db: Session = Depends(get_db)
-):
-    """
-    Upload snapshot as base64 string.
-    Bypasses presigned URL issues with NAT/ngrok.
-    """
-    try:
-        event_uuid = uuid.UUID(event_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid event_id format")
-    
-    event = db.query(Event).filter(Event.id == event_uuid).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Decode base64 image
-    try:
-        image_bytes = base64.b64decode(image_data)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid base64 image data")
-    
-    # Upload to MinIO
+
+async def _store_snapshot(event: Event, image_bytes: bytes, db: AsyncSession) -> EventFinalizeResponse:
+    """Upload snapshot bytes to MinIO and finalize the event."""
     object_name = f"snapshots/{event.id}.jpg"
     try:
-        from ..config import settings
-        storage._get_client().put_object(
-            settings.minio_bucket,
-            object_name,
-            BytesIO(image_bytes),
-            len(image_bytes),
-            content_type="image/jpeg"
-        )
-        snapshot_url = f"/snapshots/{event.id}.jpg"
+        await run_in_threadpool(storage.upload_object, object_name, image_bytes, "image/jpeg")
     except Exception as e:
         print(f"MinIO upload error: {e}")
-        snapshot_url = f"/snapshots/{event.id}.jpg"
+    snapshot_url = f"/snapshots/{event.id}.jpg"
     
     # Update event
     event.snapshot_url = snapshot_url
-    db.commit()
-    db.refresh(event)
+    await db.commit()
     
     return EventFinalizeResponse(
         event_id=event.id,
         status="finalized",
-        snapshot_url=event.snapshot_url
+        snapshot_url=snapshot_url
+    )
+
+
+@router.post("/ingest", response_model=EventFinalizeResponse)
+async def ingest_event(
+    request: Request,
+    device_id: Optional[uuid.UUID] = Query(None, description="Device ID (optional, uses default if not provided)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create an event and store its snapshot in one request.
+    
+    Takes a raw JPEG body (Content-Type: image/jpeg). Same result as start
+    followed by upload-binary, in one round-trip instead of two.
+    """
+    image_bytes = await request.body()
+    if not image_bytes:
+        raise HTTPException(status_code=400, detail="Empty image body")
+    
+    event_id = uuid.uuid4()
+    snapshot_url = f"/snapshots/{event_id}.jpg"
+    await _create_event(db, event_id, device_id, snapshot_url)
+    
+    try:
+        await run_in_threadpool(storage.upload_object, f"snapshots/{event_id}.jpg", image_bytes, "image/jpeg")
+    except Exception as e:
+        print(f"MinIO upload error: {e}")
+    
+    return EventFinalizeResponse(
+        event_id=event_id,
+        status="finalized",
+        snapshot_url=snapshot_url
     )
 
+
+@router.post("/{event_id}/upload-base64", response_model=EventFinalizeResponse)
+async def upload_snapshot_base64(
+    event_id: uuid.UUID,
+    image_data: str = Body(..., embed=True),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload snapshot as base64 string.
+    Bypasses presigned URL issues with NAT/ngrok.
+    """
+    event = await _find_event(db, event_id)
+    
+    # Decode base64 image (a2b_base64 reads the ASCII str buffer directly)
+    try:
+        image_bytes = binascii.a2b_base64(image_data)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid base64 image data")
+    
+    return await _store_snapshot(event, image_bytes, db)
+
+
+@router.post("/{event_id}/upload-binary", response_model=EventFinalizeResponse)
+async def upload_snapshot_binary(
+    event_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload snapshot as a raw JPEG body (Content-Type: image/jpeg).
+    Same as upload-base64 without the base64 size overhead and decode step.
+    """
+    event = await _find_event(db, event_id)
+    
+    image_bytes = await request.body()
+    if not image_bytes:
+        raise HTTPException(status_code=400, detail="Empty image body")
+    
+    return await _store_snapshot(event, image_bytes, db)
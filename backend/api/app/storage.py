@@ -2,68 +2,127 @@
 MinIO/S3 storage client and presigned URL generation.
 """
 
-from datetime import timedelta
+import hashlib
+import hmac
+from datetime import datetime, timezone
+from io import BytesIO
+from urllib.parse import quote
 from minio import Minio
 from minio.error import S3Error
 from .config import settings
 
 
+def _hmac_sha256(key: bytes, message: str) -> bytes:
+    """HMAC-SHA256 digest of a message."""
+    return hmac.new(key, message.encode(), hashlib.sha256).digest()
+
+
 class StorageClient:
     """MinIO storage client for presigned URL generation."""
     
     def __init__(self):
-        self._client = None
+        if not settings.minio_endpoint:
+            raise ValueError("MINIO_ENDPOINT must be set")
+        
+        # MinIO client (internal endpoint, control-plane ops)
+        self._client = Minio(
+            settings.minio_endpoint,
+            access_key=settings.minio_access_key,
+            secret_key=settings.minio_secret_key,
+            secure=settings.minio_secure
+        )
         self._initialized = False
-    
-    def _get_client(self) -> Minio:
-        """Get or create MinIO client."""
-        if self._client is None:
-            self._client = Minio(
-                settings.minio_endpoint,
-                access_key=settings.minio_access_key,
-                secret_key=settings.minio_secret_key,
-                secure=settings.minio_secure
-            )
-        return self._client
+        # SigV4 signing key, derived once per UTC day
+        self._signing_key = None
+        self._signing_date = None
+        
+        # Fixed parts of presigned URLs, templated once for the external endpoint
+        protocol = "https" if settings.minio_secure else "http"
+        self._external_base = f"{protocol}://{settings.minio_external_endpoint}"
+        self._bucket_path = f"/{settings.minio_bucket}/"
+        self._credential_prefix = quote(f"{settings.minio_access_key}/", safe="~")
+        self._scope_suffix = f"/{settings.minio_region}/s3/aws4_request"
+        self._query_suffix = (
+            f"&X-Amz-Expires={settings.presigned_url_expiry}"
+            "&X-Amz-SignedHeaders=host"
+        )
+        self._canonical_suffix = (
+            f"\nhost:{settings.minio_external_endpoint}\n\nhost\nUNSIGNED-PAYLOAD"
+        )
     
     def ensure_bucket_exists(self):
-        """Create the bucket if it doesn't exist."""
-        client = self._get_client()
+        """Create the bucket if it doesn't exist (one S3 call either way)."""
         try:
-            if not client.bucket_exists(settings.minio_bucket):
-                client.make_bucket(settings.minio_bucket)
-                print(f"[Storage] Created bucket: {settings.minio_bucket}")
-            else:
-                print(f"[Storage] Bucket exists: {settings.minio_bucket}")
-            self._initialized = True
+            self._client.make_bucket(settings.minio_bucket)
         except S3Error as e:
-            print(f"[Storage] Error creating bucket: {e}")
-            raise
+            if e.code not in ("BucketAlreadyOwnedByYou", "BucketAlreadyExists"):
+                print(f"[Storage] Error creating bucket: {e}")
+                raise
+        print(f"[Storage] Bucket ready: {settings.minio_bucket}")
+        self._initialized = True
+    
+    def _get_signing_key(self, date_stamp: str) -> bytes:
+        """Get the SigV4 signing key for a date, deriving it on day change."""
+        if self._signing_date != date_stamp:
+            key = _hmac_sha256(f"AWS4{settings.minio_secret_key}".encode(), date_stamp)
+            key = _hmac_sha256(key, settings.minio_region)
+            key = _hmac_sha256(key, "s3")
+            self._signing_key = _hmac_sha256(key, "aws4_request")
+            self._signing_date = date_stamp
+        return self._signing_key
     
     def generate_presigned_upload_url(self, object_name: str) -> str:
         """
         Generate a presigned URL for uploading an object.
         
+        The URL is signed locally (AWS SigV4 query auth) against the external
+        endpoint, so no MinIO round-trip or host rewrite is needed.
+        
         Args:
             object_name: Name of the object (file) to upload
             
         Returns:
             Presigned URL for PUT request
         """
-        client = self._get_client()
+        amz_date = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = amz_date[:8]
+        scope = f"{date_stamp}{self._scope_suffix}"
         
-        # Generate presigned URL for upload
-        url = client.presigned_put_object(
-            settings.minio_bucket,
-            object_name,
-            expires=timedelta(seconds=settings.presigned_url_expiry)
+        path = f"{self._bucket_path}{quote(object_name, safe='/~')}"
+        query = (
+            "X-Amz-Algorithm=AWS4-HMAC-SHA256"
+            f"&X-Amz-Credential={self._credential_prefix}{quote(scope, safe='~')}"
+            f"&X-Amz-Date={amz_date}"
+            f"{self._query_suffix}"
+        )
+        
+        canonical_request = f"PUT\n{path}\n{query}{self._canonical_suffix}"
+        string_to_sign = (
+            f"AWS4-HMAC-SHA256\n{amz_date}\n{scope}\n"
+            f"{hashlib.sha256(canonical_request.encode()).hexdigest()}"
         )
+        signature = hmac.new(
+            self._get_signing_key(date_stamp), string_to_sign.encode(), hashlib.sha256
+        ).hexdigest()
         
-        # Replace internal endpoint with external endpoint for client access
-        if settings.minio_endpoint != settings.minio_external_endpoint:
-            url = url.replace(settings.minio_endpoint, settings.minio_external_endpoint)
+        return f"{self._external_base}{path}?{query}&X-Amz-Signature={signature}"
+    
+    def upload_object(self, object_name: str, data: bytes, content_type: str = "application/octet-stream"):
+        """
+        Upload an object to the bucket.
         
-        return url
+        Args:
+            object_name: Name of the object (file) to upload
+            data: Object contents
+            content_type: MIME type of the object
+        """
+        self._client.put_object(
+            settings.minio_bucket,
+            object_name,
+            BytesIO(data),
+            len(data),
+            content_type=content_type
+        )
     
     def get_object_url(self, object_name: str) -> str:
         """
@@ -75,8 +134,7 @@ class StorageClient:
         Returns:
             URL to access the object
         """
-        protocol = "https" if settings.minio_secure else "http"
-        return f"{protocol}://{settings.minio_external_endpoint}/{settings.minio_bucket}/{object_name}"
+        return f"{self._external_base}{self._bucket_path}{object_name}"
 
 
 # Global storage client instance
@@ -0,0 +1,55 @@
+"""Add the event listing index and a unique device name index
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Older deployments could race and create several "default" devices.
+    # Fold duplicates into the oldest row so the unique index can be built.
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT id, first_value(id) OVER (PARTITION BY name ORDER BY created_at, id) AS keep_id
+            FROM devices
+        )
+        UPDATE events SET device_id = ranked.keep_id
+        FROM ranked
+        WHERE events.device_id = ranked.id AND ranked.id <> ranked.keep_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM devices d
+        USING devices keep
+        WHERE d.name = keep.name
+          AND (keep.created_at, keep.id) < (d.created_at, d.id)
+        """
+    )
+
+    # CONCURRENTLY avoids locking the tables against writes while building
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_devices_name", "devices", ["name"],
+            unique=True, if_not_exists=True, postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_events_started_at", "events", [sa.text("started_at DESC")],
+            if_not_exists=True, postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_events_started_at", "events", if_exists=True, postgresql_concurrently=True)
+        op.drop_index("ix_devices_name", "devices", if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""Store event and device timestamps as timestamptz with database defaults
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table, column in (("events", "started_at"), ("devices", "created_at")):
+        existing = next(c for c in inspector.get_columns(table) if c["name"] == column)
+        if getattr(existing["type"], "timezone", False):
+            # Table created by init_db from the current models; only the
+            # default and NOT NULL may be missing
+            op.execute(f"UPDATE {table} SET {column} = now() WHERE {column} IS NULL")
+            op.alter_column(table, column, server_default=sa.func.now(), nullable=False)
+            continue
+
+        # Existing values were written by datetime.utcnow(), so they are naive UTC
+        op.execute(f"UPDATE {table} SET {column} = now() AT TIME ZONE 'UTC' WHERE {column} IS NULL")
+        op.alter_column(
+            table, column,
+            type_=sa.DateTime(timezone=True),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            server_default=sa.func.now(),
+            nullable=False
+        )
+
+
+def downgrade():
+    for table, column in (("events", "started_at"), ("devices", "created_at")):
+        op.alter_column(
+            table, column,
+            type_=sa.DateTime(),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            server_default=None,
+            nullable=True
+        )
@@ -4,29 +4,36 @@ Database initialization script.
 Creates tables and optionally seeds with test data.
 """
 
+import argparse
+import asyncio
 import sys
 import os
+import uuid
+from datetime import datetime, timedelta, timezone
 
 # Add app to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import select
+
 from app.database import engine, SessionLocal, Base
 from app.models import Device, Event
 
 
-def init_database():
+async def init_database():
     """Create all tables."""
     print("[Init] Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     print("[Init] Tables created successfully!")
 
 
-def create_test_device():
+async def create_test_device():
     """Create a test device for development."""
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         # Check if device already exists
-        existing = db.query(Device).filter(Device.name == "test-device").first()
+        result = await db.execute(select(Device).where(Device.name == "test-device"))
+        existing = result.scalar_one_or_none()
         if existing:
             print(f"[Init] Test device already exists: {existing.id}")
             return existing
@@ -34,27 +41,66 @@ def create_test_device():
         # Create test device
         device = Device(name="test-device")
         db.add(device)
-        db.commit()
-        db.refresh(device)
+        await db.commit()
+        await db.refresh(device)
         
         print(f"[Init] Created test device:")
         print(f"       ID: {device.id}")
         print(f"       Name: {device.name}")
         
         return device
-    finally:
-        db.close()
+
+
+async def seed_test_events(device_id: uuid.UUID, count: int):
+    """
+    Bulk-insert test events for a device.
+    
+    Uses the binary COPY protocol through the underlying asyncpg connection,
+    which is much faster than row-by-row INSERTs for large seeds.
+    
+    Args:
+        device_id: Device that owns the events
+        count: Number of events to create, one minute apart
+    """
+    now = datetime.now(timezone.utc)
+    records = [
+        (uuid.uuid4(), device_id, now - timedelta(minutes=i), None)
+        for i in range(count)
+    ]
+    
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "events",
+            records=records,
+            columns=["id", "device_id", "started_at", "snapshot_url"]
+        )
+    
+    print(f"[Init] Seeded {count} test events")
+
+
+async def main(seed_events: int = 0):
+    """Create tables, the test device and optionally test events."""
+    await init_database()
+    print()
+    device = await create_test_device()
+    if seed_events > 0:
+        await seed_test_events(device.id, seed_events)
+    await engine.dispose()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Initialize the Smart Doorbell database")
+    parser.add_argument("--seed-events", type=int, default=0,
+                        help="Number of test events to bulk-insert for the test device")
+    args = parser.parse_args()
+    
     print("=" * 50)
     print("Smart Doorbell - Database Initialization")
     print("=" * 50)
     print()
     
-    init_database()
-    print()
-    create_test_device()
+    asyncio.run(main(args.seed_events))
     
     print()
     print("[Init] Done!")
@@ -6,14 +6,126 @@ Supports WAV, MP3, and other common audio formats.
 """
 #imports
 import os
+import platform
+import queue
+import subprocess
 import threading
+import wave
 from pathlib import Path
+import numpy as np
 from . import config
 
+# Optional players, resolved once here rather than re-attempted on every alert
+try:
+    from playsound import playsound
+except ImportError:
+    playsound = None
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+try:
+    import sounddevice as sd
+except (ImportError, OSError):  # OSError: PortAudio library missing
+    sd = None
+
+# Alerts are played one at a time by a single long-lived worker thread
+_alerts: queue.Queue = queue.Queue(maxsize=1)
+_worker = None
+_worker_lock = threading.Lock()
+
+# Decoded WAV samples by path, so repeat alerts skip the disk and the parse
+_wav_cache = {}
+
+
+def load_wav(audio_file: str):
+    """
+    Read a WAV file into memory (cached per path).
+    
+    Returns:
+        (samples as a frames x channels array, sample rate), or None if the file
+        is missing, unreadable or in a format the wave module can't decode
+        (callers then fall back to a system player)
+    """
+    if audio_file not in _wav_cache:
+        dtypes = {1: np.uint8, 2: np.int16, 4: np.int32}
+        sound = None
+        try:
+            with wave.open(audio_file, "rb") as w:
+                dtype = dtypes.get(w.getsampwidth())
+                if dtype is None:
+                    print(f"[Audio] Unsupported sample width in {audio_file}")
+                else:
+                    data = np.frombuffer(w.readframes(w.getnframes()), dtype=dtype)
+                    sound = (data.reshape(-1, w.getnchannels()), w.getframerate())
+        except (OSError, EOFError, wave.Error) as e:
+            # e.g. a truncated file, or WAVE_FORMAT_EXTENSIBLE before Python 3.12
+            print(f"[Audio] Can't load {audio_file}: {e or type(e).__name__}")
+        _wav_cache[audio_file] = sound
+    return _wav_cache[audio_file]
+
+
+def play_file(audio_file: str):
+    """
+    Play an audio file to completion on the calling thread.
+    
+    Tries playsound, pygame, sounddevice (WAVs, not on Linux) and finally the
+    system player; errors are printed, not raised.
+    """
+    try:
+        # Try using playsound (cross-platform)
+        if playsound is not None:
+            playsound(audio_file)
+            return
+        
+        # Try pygame (more reliable on Pi)
+        if pygame is not None:
+            pygame.mixer.init()
+            pygame.mixer.music.load(audio_file)
+            pygame.mixer.music.play()
+            while pygame.mixer.music.get_busy():
+                pygame.time.wait(100)
+            return
+        
+        system = platform.system()
+        
+        # WAVs from memory through sounddevice, without spawning a player process
+        # (not on Linux, where paplay keeps the device shareable with the mic relay)
+        if sd is not None and system != "Linux" and audio_file.lower().endswith(".wav"):
+            sound = load_wav(audio_file)
+            if sound is not None:
+                sd.play(*sound)
+                sd.wait()
+                return
+        
+        # Fallback: system command
+        if system == "Windows":
+            # Use PowerShell to play audio on Windows
+            subprocess.run(
+                ["powershell", "-c", f"(New-Object Media.SoundPlayer '{audio_file}').PlaySync()"],
+                capture_output=True
+            )
+        elif system == "Darwin":  # macOS
+            subprocess.run(["afplay", audio_file], capture_output=True)
+        else:  # Linux
+            # Use paplay (PulseAudio) to allow device sharing
+            subprocess.run(["paplay", audio_file], capture_output=True)
+                
+    except Exception as e:
+        print(f"[Audio] Error playing audio: {e}")
+
+
+def _alert_loop():
+    """Play queued alerts one after another (worker thread)."""
+    while True:
+        play_file(_alerts.get())
+
 
 def play_audio(file_path: str = None):
     """
-    Play an audio file in a background thread.
+    Play an audio file on the background audio thread.
     
     Args:
         file_path: Path to audio file. Uses config.ALERT_AUDIO_FILE if not provided.
@@ -23,51 +135,17 @@ def play_audio(file_path: str = None):
     if not audio_file or not Path(audio_file).exists():
         return
     
-    def _play():
-        try:
-            # Try using playsound (cross-platform)
-            try:
-                from playsound import playsound
-                playsound(audio_file)
-                return
-            except ImportError:
-                pass
-            
-            # Try pygame (more reliable on Pi)
-            try:
-                import pygame
-                pygame.mixer.init()
-                pygame.mixer.music.load(audio_file)
-                pygame.mixer.music.play()
-                while pygame.mixer.music.get_busy():
-                    pygame.time.wait(100)
-                return
-            except ImportError:
-                pass
-            
-            # Fallback: system command
-            import subprocess
-            import platform
-            
-            system = platform.system()
-            if system == "Windows":
-                # Use PowerShell to play audio on Windows
-                subprocess.run(
-                    ["powershell", "-c", f"(New-Object Media.SoundPlayer '{audio_file}').PlaySync()"],
-                    capture_output=True
-                )
-            elif system == "Darwin":  # macOS
-                subprocess.run(["afplay", audio_file], capture_output=True)
-            else:  # Linux
-                # Use paplay (PulseAudio) to allow device sharing
-                subprocess.run(["paplay", audio_file], capture_output=True)
-                    
-        except Exception as e:
-            print(f"[Audio] Error playing audio: {e}")
-    
-    # Play in background thread to not block
-    thread = threading.Thread(target=_play, daemon=True)
-    thread.start()
+    # Play on the background worker so the caller never blocks; an alert that is
+    # already waiting makes this one redundant
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_alert_loop, daemon=True)
+            _worker.start()
+    try:
+        _alerts.put_nowait(audio_file)
+    except queue.Full:
+        pass
 
 
 if __name__ == "__main__":
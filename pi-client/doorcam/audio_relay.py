@@ -2,13 +2,22 @@
 Audio Relay Module
 
 Captures audio from microphone and plays it through speakers in real-time.
-Uses subprocess with arecord/aplay for better Raspberry Pi compatibility.
+Uses subprocess with parec/pacat or arecord/aplay for better Raspberry Pi compatibility.
 """
 
+import re
 import subprocess
 import threading
 import time
 import platform
+from typing import Optional
+
+# Webcam ALSA device found by `arecord -l`, cached for the life of the process
+_detected_device: Optional[str] = None
+
+# `arecord -l` lines look like "card 2: U0x46d0x825 [USB Device 0x46d:0x825], device 0: ..."
+_CARD_RE = re.compile(r'^card\s+(\d+):(.*)$', re.IGNORECASE | re.MULTILINE)
+_WEBCAM_RE = re.compile(r'usb|webcam|jvcu', re.IGNORECASE)
 
 
 class AudioRelay:
@@ -16,9 +25,13 @@ class AudioRelay:
     Real-time audio passthrough from microphone to speakers.
     
     Uses arecord/aplay on Linux (Pi) for reliable webcam mic support.
-    Falls back to PyAudio on Windows/Mac.
+    Uses sounddevice (or PyAudio) on Windows/Mac.
     """
     
+    # Restart delay bounds (seconds) when the relay pipeline exits unexpectedly
+    RESTART_BACKOFF_MIN = 0.5
+    RESTART_BACKOFF_MAX = 8.0
+    
     def __init__(self, device: str = None):
         """
         Initialize audio relay.
@@ -28,11 +41,16 @@ class AudioRelay:
         """
         self.device = device
         self._running = False
-        self._process = None
+        self._stop_event = threading.Event()
+        self._processes = []
         self._thread = None
     
     def _find_webcam_device(self) -> str:
-        """Find the webcam audio device."""
+        """Find the webcam audio device (detected once per process)."""
+        global _detected_device
+        if _detected_device is not None:
+            return _detected_device
+        
         try:
             result = subprocess.run(
                 ["arecord", "-l"],
@@ -41,62 +59,147 @@ class AudioRelay:
             )
             
             # Parse output for webcam/USB device
-            for line in result.stdout.split('\n'):
-                if 'card' in line.lower():
-                    # Extract card name
-                    if 'usb' in line.lower() or 'webcam' in line.lower() or 'jvcu' in line.lower():
-                        # Extract card number or name
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            card_part = parts[0]
-                            card_num = ''.join(filter(str.isdigit, card_part))
-                            if card_num:
-                                return f"plughw:{card_num},0"
+            for match in _CARD_RE.finditer(result.stdout):
+                if _WEBCAM_RE.search(match.group(2)):
+                    _detected_device = f"plughw:{match.group(1)},0"
+                    return _detected_device
             
             # Default fallback
             return "plughw:1,0"
         except:
             return "plughw:1,0"
     
+    def _spawn_pipeline(self, record_cmd: list, play_cmd: list):
+        """
+        Start a recorder piped straight into a player (no shell).
+        
+        Args:
+            record_cmd: Command writing raw audio to stdout
+            play_cmd: Command reading raw audio from stdin
+            
+        Returns:
+            The player process; the pipeline ends when it exits
+            
+        Raises:
+            OSError: A command couldn't be started (e.g. not installed); nothing is left running
+        """
+        record = subprocess.Popen(
+            record_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        try:
+            play = subprocess.Popen(
+                play_cmd,
+                stdin=record.stdout,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+        except OSError:
+            record.kill()
+            record.wait()
+            raise
+        finally:
+            # Only the player should hold the read end, so the recorder gets
+            # SIGPIPE if the player dies
+            record.stdout.close()
+        self._processes = [play, record]
+        return play
+    
     def _relay_loop_linux(self):
-        """Audio relay using arecord | aplay (Linux/Pi)."""
+        """Audio relay using parec | pacat, falling back to arecord | aplay (Linux/Pi)."""
         device = self.device or self._find_webcam_device()
         
         print(f"[AudioRelay] Starting with device: {device}")
         
+        # Direct ALSA with small periods (ring = 4 periods), for when PulseAudio
+        # is missing or its pipeline dies
+        alsa_format = ["-f", "cd", "-t", "raw", "--period-size=512", "--buffer-size=2048"]
+        alsa_pipeline = (["arecord", "-D", device, *alsa_format], ["aplay", *alsa_format])
+        
         try:
-            # Use PulseAudio parec/paplay for real-time relay (allows device sharing)
-            # parec records from default source, pacat plays to default sink
-            self._process = subprocess.Popen(
-                "parec --latency-msec=50 | pacat --latency-msec=50",
-                shell=True,
-                start_new_session=True
-            )
+            try:
+                # Use PulseAudio parec/pacat for real-time relay (allows device sharing)
+                # parec records from default source, pacat plays to default sink
+                process = self._spawn_pipeline(
+                    ["parec", "--latency-msec=50"],
+                    ["pacat", "--latency-msec=50"]
+                )
+            except OSError as e:
+                # e.g. Pi OS Lite without PulseAudio
+                print(f"[AudioRelay] PulseAudio tools unavailable ({e}), using ALSA")
+                process = self._spawn_pipeline(*alsa_pipeline)
             
             print("[AudioRelay] Started - mic → speakers")
             
-            # Wait for process or stop signal
-            while self._running:
-                if self._process.poll() is not None:
-                    # Process ended unexpectedly
-                    if self._running:
-                        print("[AudioRelay] Process ended, restarting...")
-                        time.sleep(0.5)
-                        self._process = subprocess.Popen(
-                            f"arecord -D {device} -f cd -t raw 2>/dev/null | aplay -f cd -t raw 2>/dev/null",
-                            shell=True,
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL
-                        )
-                time.sleep(0.1)
+            backoff = self.RESTART_BACKOFF_MIN
+            while not self._stop_event.is_set():
+                started = time.monotonic()
+                # Block until the pipeline exits (stop() kills it to wake us)
+                process.wait()
+                if self._stop_event.is_set():
+                    break
+                
+                # Process ended unexpectedly; back off if it keeps dying quickly
+                if time.monotonic() - started > self.RESTART_BACKOFF_MAX:
+                    backoff = self.RESTART_BACKOFF_MIN
+                print(f"[AudioRelay] Process ended, restarting in {backoff:.1f}s...")
+                self._cleanup()
+                if self._stop_event.wait(backoff):
+                    break
+                backoff = min(backoff * 2, self.RESTART_BACKOFF_MAX)
+                
+                # Fall back to direct ALSA; stop() may land while spawning, so
+                # check on both sides (the finally below cleans up a late spawn)
+                if self._stop_event.is_set():
+                    break
+                process = self._spawn_pipeline(*alsa_pipeline)
+                if self._stop_event.is_set():
+                    break
                 
         except Exception as e:
             print(f"[AudioRelay] Error: {e}")
         finally:
             self._cleanup()
     
+    def _relay_loop_portaudio(self):
+        """Audio relay using sounddevice raw streams (Windows/Mac), else PyAudio."""
+        try:
+            import sounddevice as sd
+        except (ImportError, OSError):  # OSError: PortAudio library missing
+            self._relay_loop_pyaudio()
+            return
+        
+        try:
+            # Find input device
+            input_device = None
+            for i, info in enumerate(sd.query_devices()):
+                if info['max_input_channels'] > 0:
+                    name = info['name'].lower()
+                    if 'usb' in name or 'webcam' in name or 'camera' in name:
+                        input_device = i
+                        print(f"[AudioRelay] Using: {info['name']}")
+                        break
+            
+            # Blocking read/write on raw int16 buffers; PortAudio waits in C
+            # with the GIL released, and no Python runs on its audio thread
+            stream_options = dict(samplerate=44100, channels=1, dtype='int16',
+                                  blocksize=1024, latency='low')
+            with sd.RawInputStream(device=input_device, **stream_options) as stream_in, \
+                    sd.RawOutputStream(**stream_options) as stream_out:
+                print("[AudioRelay] Started - mic → speakers")
+                
+                while self._running:
+                    data, _ = stream_in.read(1024)
+                    stream_out.write(data)
+            
+        except Exception as e:
+            print(f"[AudioRelay] Error: {e}")
+    
     def _relay_loop_pyaudio(self):
-        """Audio relay using PyAudio (Windows/Mac)."""
+        """Audio relay using PyAudio (fallback when sounddevice is missing)."""
         try:
             import pyaudio
             
@@ -151,19 +254,18 @@ class AudioRelay:
     
     def _cleanup(self):
         """Clean up processes."""
-        if self._process:
+        processes, self._processes = self._processes, []
+        for process in processes:
             try:
-                # Kill the PulseAudio parec/pacat processes
-                subprocess.run(["pkill", "-f", "parec"], capture_output=True)
-                subprocess.run(["pkill", "-f", "pacat"], capture_output=True)
-            except:
+                process.terminate()
+            except OSError:
                 pass
+        for process in processes:
             try:
-                self._process.kill()
-                self._process.wait(timeout=1)
-            except:
-                pass
-            self._process = None
+                process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
         print("[AudioRelay] Cleaned up")
     
     def start(self):
@@ -172,12 +274,13 @@ class AudioRelay:
             return
         
         self._running = True
+        self._stop_event.clear()
         
         # Choose method based on platform
         if platform.system() == "Linux":
             target = self._relay_loop_linux
         else:
-            target = self._relay_loop_pyaudio
+            target = self._relay_loop_portaudio
         
         self._thread = threading.Thread(target=target, daemon=True)
         self._thread.start()
@@ -189,6 +292,7 @@ class AudioRelay:
         
         print("[AudioRelay] Stopping...")
         self._running = False
+        self._stop_event.set()
         self._cleanup()
         
         if self._thread:
@@ -8,11 +8,14 @@ Supports auto-detection of camera devices and warmup frames.
 import cv2
 import time
 import glob
+import itertools
+import queue
 import threading
 import numpy as np
 from pathlib import Path
 from typing import Optional, Tuple
 from . import config
+from .jpeg import encode_jpeg
 
 
 class CameraManager:
@@ -23,7 +26,8 @@ class CameraManager:
     - Auto-detect camera from /dev/v4l/by-id/* (Linux)
     - Fallback to index-based detection (Windows/Mac)
     - Warmup frames before capture
-    - Live preview with OpenCV window
+    - Background capture thread feeding a frame queue
+    - Live preview with OpenCV window (on the calling thread)
     - Thread-safe operations
     """
     
@@ -53,12 +57,17 @@ class CameraManager:
         
         self._cap: Optional[cv2.VideoCapture] = None
         self._lock = threading.Lock()
-        self._preview_running = False
-        self._preview_thread: Optional[threading.Thread] = None
+        self._capture_running = False
+        self._capture_thread: Optional[threading.Thread] = None
+        self._frames: queue.Queue = queue.Queue(maxsize=2)
+        # Only render every Nth frame in previews (~10 Hz at 30 fps); keys are polled every frame
+        self._display_divisor = 3
         
-        # Statistics
+        # Statistics (next() on itertools.count is atomic, so counting needs no lock)
         self.frames_captured = 0
         self.snapshots_taken = 0
+        self._frame_counter = itertools.count(1)
+        self._snapshot_counter = itertools.count(1)
     
     def _find_camera_device(self) -> str:
         """Auto-detect camera device path."""
@@ -114,10 +123,15 @@ class CameraManager:
                 self._cap = None
                 return False
             
-            # Configure camera
+            # Configure camera; MJPEG is requested before the size so the
+            # driver can offer resolutions that raw YUYV can't sustain over USB
+            if config.CAMERA_FOURCC:
+                self._cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.CAMERA_FOURCC))
             self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
             self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
             self._cap.set(cv2.CAP_PROP_FPS, self.fps)
+            # Keep only the newest frame queued so reads are never stale
+            self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
             # Get actual settings
             actual_w = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -129,14 +143,15 @@ class CameraManager:
             # Warmup frames
             print(f"[Camera] Warming up ({self.warmup_frames} frames)...")
             for _ in range(self.warmup_frames):
-                self._cap.read()
+                # grab() dequeues without decoding; the frames are discarded anyway
+                self._cap.grab()
             print("[Camera] Ready")
             
             return True
     
     def close(self):
         """Close the camera device."""
-        self.stop_preview()
+        self.stop_capture()
         
         with self._lock:
             if self._cap is not None:
@@ -156,10 +171,11 @@ class CameraManager:
                 return None
             
             ret, frame = self._cap.read()
-            if ret:
-                self.frames_captured += 1
-                return frame
+        
+        if not ret:
             return None
+        self.frames_captured = next(self._frame_counter)
+        return frame
     
     def capture_snapshot(self, output_path: str = None, quality: int = 95) -> Optional[bytes]:
         """
@@ -177,118 +193,116 @@ class CameraManager:
             print("[Camera] Failed to capture snapshot")
             return None
         
-        # Encode as JPEG
-        encode_params = [cv2.IMWRITE_JPEG_QUALITY, quality]
-        ret, jpeg_data = cv2.imencode('.jpg', frame, encode_params)
+        # Encode as JPEG (libjpeg-turbo when available)
+        jpeg_data = encode_jpeg(frame, quality)
         
-        if not ret:
+        if jpeg_data is None:
             print("[Camera] Failed to encode JPEG")
             return None
         
-        self.snapshots_taken += 1
+        self.snapshots_taken = next(self._snapshot_counter)
         
         if output_path:
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
             with open(output_path, 'wb') as f:
-                f.write(jpeg_data.tobytes())
+                f.write(jpeg_data)
             print(f"[Camera] Snapshot saved: {output_path}")
             return None
         
-        return jpeg_data.tobytes()
+        return jpeg_data
     
-    def start_preview(self, window_name: str = "Camera Preview"):
+    def start_capture(self) -> bool:
         """
-        Start live preview in an OpenCV window.
+        Start reading frames continuously in a background thread.
         
-        Args:
-            window_name: Name of the preview window
+        Frames are handed over through a small queue (see get_frame), so
+        capture keeps running while the consumer draws or processes.
+        
+        Returns:
+            True if the capture thread is running
         """
-        if self._preview_running:
-            print("[Camera] Preview already running")
-            return
+        if self._capture_running:
+            return True
         
         if not self.open():
-            print("[Camera] Cannot start preview - camera not available")
-            return
+            print("[Camera] Cannot start capture - camera not available")
+            return False
         
-        self._preview_running = True
-        self._preview_thread = threading.Thread(
-            target=self._preview_loop,
-            args=(window_name,),
-            daemon=True
-        )
-        self._preview_thread.start()
-        print(f"[Camera] Preview started: '{window_name}'")
+        self._capture_running = True
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+        return True
     
-    def _preview_loop(self, window_name: str):
-        """Internal preview loop running in a thread."""
-        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(window_name, self.width, self.height)
-        
-        fps_counter = 0
-        fps_start = time.time()
-        display_fps = 0.0
-        
-        while self._preview_running:
+    def _capture_loop(self):
+        """Internal capture loop running in a thread (no GUI calls)."""
+        while self._capture_running:
             frame = self.read_frame()
             if frame is None:
                 time.sleep(0.1)
                 continue
             
-            # Calculate FPS
-            fps_counter += 1
-            elapsed = time.time() - fps_start
-            if elapsed >= 1.0:
-                display_fps = fps_counter / elapsed
-                fps_counter = 0
-                fps_start = time.time()
-            
-            # Add info overlay
-            info_text = f"FPS: {display_fps:.1f} | {frame.shape[1]}x{frame.shape[0]}"
-            cv2.putText(
-                frame, info_text, (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2
-            )
-            
-            # Add instructions
-            cv2.putText(
-                frame, "Press 'q' to quit, 's' to snapshot", (10, frame.shape[0] - 10),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1
-            )
-            
-            cv2.imshow(window_name, frame)
+            # Drop the oldest frame rather than block when the consumer lags
+            try:
+                self._frames.put_nowait(frame)
+            except queue.Full:
+                try:
+                    self._frames.get_nowait()
+                except queue.Empty:
+                    pass
+                self._frames.put_nowait(frame)
+    
+    def get_frame(self, timeout: float = None) -> Optional[np.ndarray]:
+        """
+        Get the next frame from the capture thread.
+        
+        Args:
+            timeout: Seconds to wait for a frame (None waits forever)
             
-            # Handle keyboard input
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
-                self._preview_running = False
-            elif key == ord('s'):
-                # Take a snapshot
-                timestamp = time.strftime("%Y%m%d_%H%M%S")
-                filename = f"snapshot_{timestamp}.jpg"
-                self.capture_snapshot(filename)
+        Returns:
+            Frame as numpy array (BGR), or None on timeout
+        """
+        try:
+            return self._frames.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def get_latest_frame(self, timeout: float = None) -> Optional[np.ndarray]:
+        """
+        Get the newest frame from the capture thread, skipping any older queued ones.
         
-        cv2.destroyWindow(window_name)
-        print("[Camera] Preview stopped")
+        Args:
+            timeout: Seconds to wait for a frame (None waits forever)
+            
+        Returns:
+            Frame as numpy array (BGR), or None on timeout
+        """
+        frame = self.get_frame(timeout)
+        if frame is None:
+            return None
+        while True:
+            try:
+                frame = self._frames.get_nowait()
+            except queue.Empty:
+                return frame
     
-    def stop_preview(self):
-        """Stop the live preview."""
-        if not self._preview_running:
+    def stop_capture(self):
+        """Stop the background capture thread."""
+        if not self._capture_running:
             return
         
-        self._preview_running = False
-        if self._preview_thread is not None:
-            self._preview_thread.join(timeout=2.0)
-            self._preview_thread = None
+        self._capture_running = False
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=2.0)
+            self._capture_thread = None
     
     def run_preview_blocking(self, window_name: str = "Camera Preview"):
         """
-        Run live preview in the main thread (blocking).
+        Run live preview in the calling (main) thread (blocking).
         
-        This is useful for simple testing scripts.
+        Frames are captured in a background thread; all HighGUI calls stay on
+        this thread, which some platforms (e.g. macOS) require.
         """
-        if not self.open():
-            print("[Camera] Cannot start preview - camera not available")
+        if not self.start_capture():
             return
         
         print(f"[Camera] Starting blocking preview: '{window_name}'")
@@ -303,10 +317,9 @@ class CameraManager:
         
         try:
             while True:
-                frame = self.read_frame()
+                frame = self.get_frame(timeout=0.5)
                 if frame is None:
-                    print("[Camera] Failed to read frame, retrying...")
-                    time.sleep(0.5)
+                    print("[Camera] No frames received, retrying...")
                     continue
                 
                 # Calculate FPS
@@ -317,21 +330,23 @@ class CameraManager:
                     fps_counter = 0
                     fps_start = time.time()
                 
-                # Add info overlay
-                info_text = f"FPS: {display_fps:.1f} | {frame.shape[1]}x{frame.shape[0]}"
-                cv2.putText(
-                    frame, info_text, (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2
-                )
-                
-                cv2.putText(
-                    frame, "Press 'q' to quit, 's' to snapshot", (10, frame.shape[0] - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1
-                )
-                
-                cv2.imshow(window_name, frame)
+                if fps_counter % self._display_divisor == 0:
+                    # Add info overlay
+                    info_text = f"FPS: {display_fps:.1f} | {frame.shape[1]}x{frame.shape[0]}"
+                    cv2.putText(
+                        frame, info_text, (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2
+                    )
+                    
+                    cv2.putText(
+                        frame, "Press 'q' to quit, 's' to snapshot", (10, frame.shape[0] - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1
+                    )
+                    
+                    cv2.imshow(window_name, frame)
                 
-                key = cv2.waitKey(1) & 0xFF
+                # 10 ms is plenty for key handling; frames pace the loop
+                key = cv2.waitKey(10) & 0xFF
                 if key == ord('q'):
                     break
                 elif key == ord('s'):
@@ -351,7 +366,7 @@ class CameraManager:
             "frames_captured": self.frames_captured,
             "snapshots_taken": self.snapshots_taken,
             "is_open": self._cap is not None and self._cap.isOpened() if self._cap else False,
-            "preview_running": self._preview_running,
+            "capture_running": self._capture_running,
             "resolution": f"{self.width}x{self.height}",
             "fps": self.fps
         }
@@ -11,6 +11,7 @@ import numpy as np
 import threading
 from typing import Callable, Optional
 from . import config
+from .camera_manager import CameraManager
 
 
 class CameraMotionDetector:
@@ -21,6 +22,10 @@ class CameraMotionDetector:
     significant pixel changes are detected.
     """
     
+    # Frames are downscaled to this size before differencing
+    PROCESS_WIDTH = 320
+    PROCESS_HEIGHT = 240
+    
     def __init__(
         self,
         callback: Callable[[], None],
@@ -28,7 +33,11 @@ class CameraMotionDetector:
         sensitivity: float = 25.0,
         min_area: int = 5000,
         cooldown_sec: float = 3.0,
-        blur_size: int = 21
+        blur_size: int = 5,
+        fps: int = 15,
+        camera: CameraManager = None,
+        use_opencl: Optional[bool] = None,
+        preview_fps: int = 5
     ):
         """
         Initialize motion detector.
@@ -37,9 +46,17 @@ class CameraMotionDetector:
             callback: Function to call when motion detected
             camera_index: Camera device index (0 = first camera)
             sensitivity: Motion threshold (lower = more sensitive)
-            min_area: Minimum contour area to trigger (pixels)
+            min_area: Minimum changed area to trigger (pixels, at capture resolution)
             cooldown_sec: Minimum time between triggers
-            blur_size: Gaussian blur kernel size (must be odd)
+            blur_size: Noise blur at processing resolution: 5 = 5x5 box blur,
+                larger (odd) = Gaussian of that size, below 5 = no blur
+            fps: Capture frame rate; the blocking read paces the detection loop
+            camera: Shared CameraManager to read frames from; if None, the
+                detector opens camera_index itself (640x480 at fps)
+            use_opencl: Run the pipeline on cv2.UMat (OpenCL device); None
+                enables it when OpenCV reports an OpenCL device
+            preview_fps: Maximum redraw rate of the preview windows; detection
+                still runs on every frame
         """
         self.callback = callback
         self.camera_index = camera_index
@@ -47,32 +64,44 @@ class CameraMotionDetector:
         self.min_area = min_area
         self.cooldown_sec = cooldown_sec
         self.blur_size = blur_size
+        self.fps = fps
+        self.preview_fps = preview_fps
         
-        self._cap: Optional[cv2.VideoCapture] = None
+        # Share an existing camera rather than opening the device a second time
+        self._owns_camera = camera is None
+        self._camera = camera or CameraManager(
+            device=str(camera_index), width=640, height=480, fps=fps
+        )
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._last_trigger_time = 0
         self._prev_frame = None
         
+        # Keep frames in device memory across the pipeline when OpenCL is usable
+        if use_opencl is None:
+            use_opencl = cv2.ocl.haveOpenCL()
+        self._use_opencl = use_opencl
+        
+        # Per-frame working buffers, reused via dst= to avoid reallocating each frame
+        size = (self.PROCESS_HEIGHT, self.PROCESS_WIDTH)
+        if use_opencl:
+            def buffer(channels=1):
+                return cv2.UMat(*size, cv2.CV_8UC(channels))
+        else:
+            def buffer(channels=1):
+                return np.empty(size + ((channels,) if channels > 1 else ()), np.uint8)
+        self._small = buffer(3)
+        self._gray = buffer()
+        self._blurred = [buffer(), buffer()]  # current/previous, alternating
+        self._blurred_ix = 0
+        self._diff = buffer()
+        self._thresh = buffer()
+        
         # Stats
         self.trigger_count = 0
         self.frames_processed = 0
         self.last_motion_area = 0
     
-    def _open_camera(self) -> bool:
-        """Open the camera."""
-        self._cap = cv2.VideoCapture(self.camera_index)
-        if not self._cap.isOpened():
-            print(f"[MotionDetect] Failed to open camera {self.camera_index}")
-            return False
-        
-        # Set resolution for faster processing
-        self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        
-        print(f"[MotionDetect] Camera {self.camera_index} opened")
-        return True
-    
     def _process_frame(self, frame) -> tuple:
         """
         Process frame for motion detection.
@@ -80,46 +109,63 @@ class CameraMotionDetector:
         Returns:
             (motion_detected: bool, motion_area: int, diff_frame)
         """
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (self.blur_size, self.blur_size), 0)
+        # Areas are reported at capture resolution
+        area_scale = (frame.shape[0] * frame.shape[1]) / (self.PROCESS_WIDTH * self.PROCESS_HEIGHT)
+        
+        # Downscale, then convert to grayscale
+        if self._use_opencl:
+            frame = cv2.UMat(frame)
+        cv2.resize(
+            frame, (self.PROCESS_WIDTH, self.PROCESS_HEIGHT),
+            dst=self._small, interpolation=cv2.INTER_AREA
+        )
+        gray = self._blurred[self._blurred_ix]
+        self._blurred_ix ^= 1
+        
+        # Smooth out sensor noise before differencing
+        if self.blur_size < 5:
+            cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=gray)
+        else:
+            cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+            if self.blur_size > 5:
+                cv2.GaussianBlur(self._gray, (self.blur_size, self.blur_size), 0, dst=gray)
+            else:
+                cv2.blur(self._gray, (5, 5), dst=gray)
         
         if self._prev_frame is None:
             self._prev_frame = gray
             return False, 0, None
         
         # Calculate frame difference
-        frame_diff = cv2.absdiff(self._prev_frame, gray)
+        cv2.absdiff(self._prev_frame, gray, dst=self._diff)
         self._prev_frame = gray
         
-        # Threshold the difference
-        thresh = cv2.threshold(frame_diff, self.sensitivity, 255, cv2.THRESH_BINARY)[1]
-        thresh = cv2.dilate(thresh, None, iterations=2)
-        
-        # Find contours
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Threshold the difference, then dilate to fill gaps in moving regions
+        # (same mask as live_display, so min_area means the same in both)
+        thresh = self._thresh
+        cv2.threshold(self._diff, self.sensitivity, 255, cv2.THRESH_BINARY, dst=thresh)
+        cv2.dilate(thresh, None, dst=thresh, iterations=2)
         
-        # Check for significant motion
-        motion_detected = False
-        total_area = 0
+        # Changed-pixel area, scaled back to capture resolution
+        total_area = cv2.countNonZero(thresh) * area_scale
+        motion_detected = total_area > self.min_area
         
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area > self.min_area:
-                motion_detected = True
-                total_area += area
-        
-        return motion_detected, total_area, thresh
+        return motion_detected, int(total_area), thresh
     
     def _detection_loop(self, show_preview: bool = False):
         """Main detection loop."""
         print("[MotionDetect] Detection loop started")
         
+        retry_delay = 0.05
+        preview_interval = 1.0 / self.preview_fps if self.preview_fps > 0 else 0.0
+        next_preview = 0.0
         while self._running:
-            ret, frame = self._cap.read()
-            if not ret:
-                time.sleep(0.1)
+            frame = self._camera.read_frame()
+            if frame is None:
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 1.0)
                 continue
+            retry_delay = 0.05
             
             self.frames_processed += 1
             motion_detected, motion_area, thresh = self._process_frame(frame)
@@ -140,19 +186,25 @@ class CameraMotionDetector:
                         print(f"[MotionDetect] Callback error: {e}")
             
             if show_preview and thresh is not None:
-                # Draw motion status
-                status = "MOTION!" if motion_detected else "Watching..."
-                color = (0, 0, 255) if motion_detected else (0, 255, 0)
-                cv2.putText(frame, status, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
-                cv2.putText(frame, f"Area: {motion_area}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-                
-                cv2.imshow("Motion Detection", frame)
-                cv2.imshow("Threshold", thresh)
+                now = time.monotonic()
+                if now >= next_preview:
+                    next_preview = now + preview_interval
+                    self._show_preview(frame, thresh, motion_detected, motion_area)
                 
+                # Keys are still polled every frame so 'q' stays responsive
                 if cv2.waitKey(1) & 0xFF == ord('q'):
                     self._running = False
-            
-            time.sleep(0.03)  # ~30 FPS
+    
+    def _show_preview(self, frame, thresh, motion_detected: bool, motion_area: int):
+        """Draw the motion status on the frame and show it with the threshold mask."""
+        # Draw motion status
+        status = "MOTION!" if motion_detected else "Watching..."
+        color = (0, 0, 255) if motion_detected else (0, 255, 0)
+        cv2.putText(frame, status, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+        cv2.putText(frame, f"Area: {motion_area}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+        
+        cv2.imshow("Motion Detection", frame)
+        cv2.imshow("Threshold", thresh)
     
     def start(self, show_preview: bool = False):
         """Start motion detection."""
@@ -160,7 +212,8 @@ class CameraMotionDetector:
             print("[MotionDetect] Already running")
             return
         
-        if not self._open_camera():
+        if not self._camera.open():
+            print(f"[MotionDetect] Failed to open camera {self._camera.device}")
             return
         
         self._running = True
@@ -188,9 +241,8 @@ class CameraMotionDetector:
             self._thread.join(timeout=2.0)
             self._thread = None
         
-        if self._cap:
-            self._cap.release()
-            self._cap = None
+        if self._owns_camera:
+            self._camera.close()
         
         cv2.destroyAllWindows()
         print("[MotionDetect] Stopped")
@@ -12,7 +12,8 @@ CAMERA_DEVICE = os.getenv("CAMERA_DEVICE", "auto")  # "auto" or specific path li
 CAMERA_WIDTH = int(os.getenv("CAMERA_WIDTH", "1920"))
 CAMERA_HEIGHT = int(os.getenv("CAMERA_HEIGHT", "1080"))
 CAMERA_FPS = int(os.getenv("CAMERA_FPS", "30"))
-CAMERA_WARMUP_FRAMES = int(os.getenv("CAMERA_WARMUP_FRAMES", "10"))
+CAMERA_WARMUP_FRAMES = int(os.getenv("CAMERA_WARMUP_FRAMES", "2"))
+CAMERA_FOURCC = os.getenv("CAMERA_FOURCC", "MJPG")  # Capture pixel format; empty = driver default
 
 # Audio Configuration - path to audio file to play on motion detection
 ALERT_AUDIO_FILE = os.getenv("ALERT_AUDIO_FILE", "alerts/doorbell.wav")  # Audio alert on motion
@@ -9,15 +9,25 @@ import cv2
 import numpy as np
 import time
 import os
-from typing import Tuple, Optional
+import queue
+import sys
+import threading
+from typing import NamedTuple, Tuple, Optional
+from .audio import load_wav, play_file
 
-# Audio playback - winsound on Windows (only supports .wav)
+# Audio playback - sounddevice (WAVs preloaded into memory; not on Linux, where
+# the system player keeps the device shareable with the mic relay), else winsound
+# on Windows (only supports .wav), else the alert player chain in audio.py
 try:
-    import winsound
-    AUDIO_BACKEND = "winsound"
-except ImportError:
-    AUDIO_BACKEND = None
-    print("[GestureDetector] No audio backend available (winsound not found)")
+    import sounddevice as sd
+    AUDIO_BACKEND = "sounddevice"
+except (ImportError, OSError):  # OSError: PortAudio library missing
+    try:
+        import winsound
+        AUDIO_BACKEND = "winsound"
+    except ImportError:
+        AUDIO_BACKEND = None
+        print("[GestureDetector] sounddevice/winsound not found - using the system audio player")
 
 # Sound files directory (same folder as this script)
 SOUNDS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -31,6 +41,34 @@ except ImportError:
     MEDIAPIPE_AVAILABLE = False
     print("[GestureDetector] MediaPipe not available - using OpenCV fallback")
 
+# MediaPipe Tasks API (HandLandmarker, can run on the GPU delegate) - mediapipe >= 0.10
+MEDIAPIPE_TASKS_AVAILABLE = False
+if MEDIAPIPE_AVAILABLE:
+    try:
+        from mediapipe.tasks import python as mp_tasks
+        from mediapipe.tasks.python import vision as mp_vision
+        from mediapipe.framework.formats import landmark_pb2
+        MEDIAPIPE_TASKS_AVAILABLE = True
+    except ImportError:
+        pass
+
+# HandLandmarker model bundle; without it the legacy mp.solutions.hands model is used
+HAND_LANDMARKER_MODEL = os.getenv(
+    "HAND_LANDMARKER_MODEL", os.path.join(SOUNDS_DIR, "hand_landmarker.task")
+)
+
+
+class HandOutline(NamedTuple):
+    """
+    Hand found by the OpenCV fallback, at contour-analysis scale.
+    
+    Frame coordinates are contour * scale + offset.
+    """
+    contour: np.ndarray
+    hull: np.ndarray          # Indices into contour (convexHull with returnPoints=False)
+    scale: float              # Analysis scale -> frame scale
+    offset: Tuple[int, int]   # Search region origin in the frame
+
 
 class GestureDetector:
     """
@@ -52,6 +90,30 @@ class GestureDetector:
         "middle": "enemy.wav"     # 🖕 Enemy
     }
     
+    # With no hand seen for IDLE_AFTER_SEC, only every IDLE_FRAME_SKIP-th frame is analysed
+    IDLE_FRAME_SKIP = 3
+    IDLE_AFTER_SEC = 1.0
+    
+    # One visitor's hand is enough to classify; each extra hand costs a landmark pass
+    MAX_HANDS = 1
+    
+    # Frames wider than this are downscaled before MediaPipe (landmarks are normalized)
+    MEDIAPIPE_MAX_WIDTH = 640
+    
+    # The OpenCV fallback (skin mask, contour, hull, defects) runs at this frame
+    # width; larger frames are downscaled first
+    OPENCV_MAX_WIDTH = 320
+    
+    # The OpenCV fallback searches for skin only around the last hand or the change
+    # that opened the idle gate, grown by this fraction of its size on each side
+    ROI_MARGIN = 0.5
+    
+    # Idle frames are first checked for change at this tiny size before the full detector
+    # runs; other frames that barely differ from the last analysed one reuse its result
+    GATE_SIZE = (80, 60)
+    GATE_PIXEL_DIFF = 15  # Per-pixel change against the background / last analysed frame
+    GATE_MIN_PIXELS = 24  # Changed pixels needed to run detection (~0.5% of the frame)
+    
     def __init__(
         self,
         cooldown_sec: float = 5.0,
@@ -79,213 +141,555 @@ class GestureDetector:
             "middle": 0
         }
         
+        # Frame skipping while idle
+        self._frame_index = 0
+        self._last_hand_time = 0
+        self._bg = None  # Running background at GATE_SIZE for the idle gate
+        self._analysed_gray = None  # Last analysed frame at GATE_SIZE, for _is_unchanged
+        
+        # Scratch buffers reused across frames (allocated on first use / size change)
+        self._mp_small = None
+        self._ycrcb_buf = None
+        
+        # HandOutline (or None) from the last frame the OpenCV fallback analysed
+        self._last_outline = None
+        self._roi = None  # (x0, y0, x1, y1) search region for the next frame, None = whole frame
+        
         # MediaPipe setup
         self._hands = None
         self._mp_hands = None
         self._mp_draw = None
+        self._use_tasks = False
+        self._video_ts = 0  # Last HandLandmarker timestamp (ms), must increase
         
         if self._use_mediapipe:
             self._mp_hands = mp.solutions.hands
-            self._hands = self._mp_hands.Hands(
-                static_image_mode=False,
-                max_num_hands=2,
-                min_detection_confidence=min_detection_confidence,
+            self._mp_draw = mp.solutions.drawing_utils
+            
+            # Prefer the Tasks HandLandmarker (GPU delegate where supported)
+            if MEDIAPIPE_TASKS_AVAILABLE and os.path.exists(HAND_LANDMARKER_MODEL):
+                self._hands = self._create_landmarker(
+                    HAND_LANDMARKER_MODEL, min_detection_confidence, min_tracking_confidence
+                )
+                self._use_tasks = self._hands is not None
+            
+            if self._hands is None:
+                self._hands = self._mp_hands.Hands(
+                    static_image_mode=False,
+                    max_num_hands=self.MAX_HANDS,
+                    model_complexity=0,  # Lite landmark model - plenty for finger up/down tests
+                    min_detection_confidence=min_detection_confidence,
+                    min_tracking_confidence=min_tracking_confidence
+                )
+            
+            # Inference runs on a worker thread so the camera loop never waits on it;
+            # single-slot queues keep only the newest frame and result
+            self._latest_hands = []
+            self._inq = queue.Queue(maxsize=1)
+            # RGB buffers not currently queued or being processed; at most one
+            # of each exists, so a third is always free once warmed up
+            self._rgb_free = queue.SimpleQueue()
+            self._outq = queue.Queue(maxsize=1)
+            self._worker = threading.Thread(target=self._inference_loop, daemon=True)
+            self._worker.start()
+        
+        # Sound file per gesture, resolved once; playback happens on its own thread
+        # so a slow sound backend never stalls detection
+        self._gesture_paths = {
+            name: os.path.join(SOUNDS_DIR, sound_file)
+            for name, sound_file in self.GESTURE_SOUNDS.items()
+        }
+        for sound_path in self._gesture_paths.values():
+            if not os.path.exists(sound_path):
+                print(f"[GestureDetector] Sound file not found: {sound_path}")
+        # Decoded samples per gesture for sounddevice, so playing never touches the disk
+        self._sounds = {}
+        if AUDIO_BACKEND == "sounddevice" and not sys.platform.startswith("linux"):
+            for name, sound_path in self._gesture_paths.items():
+                if os.path.exists(sound_path):
+                    sound = load_wav(sound_path)
+                    if sound is not None:
+                        self._sounds[name] = sound
+        self._audio_q = queue.Queue(maxsize=1)
+        self._audio_worker = threading.Thread(target=self._audio_loop, daemon=True)
+        self._audio_worker.start()
+        
+        # OpenCV fallback: skin color range in YCrCb (Y is left open, so only
+        # chroma is tested - less sensitive to lighting than HSV)
+        self.lower_skin = np.array([0, 133, 77], dtype=np.uint8)
+        self.upper_skin = np.array([255, 173, 127], dtype=np.uint8)
+        # Sized for OPENCV_MAX_WIDTH (equivalent to 11x11 on a 640-wide frame)
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+    
+    def _play_sound(self, gesture_name: str):
+        """Queue the sound associated with a gesture; dropped if one is already pending."""
+        try:
+            self._audio_q.put_nowait(gesture_name)
+        except queue.Full:
+            pass
+    
+    def _audio_loop(self):
+        """Play queued gesture sounds (worker thread)."""
+        while True:
+            gesture_name = self._audio_q.get()
+            if gesture_name is None:
+                return
+            
+            sound_path = self._gesture_paths.get(gesture_name)
+            if not sound_path:
+                continue
+            
+            try:
+                sound = self._sounds.get(gesture_name)
+                if sound is not None:
+                    sd.play(*sound)  # Returns immediately; a new sound cuts off the last
+                elif AUDIO_BACKEND == "winsound":
+                    winsound.PlaySound(sound_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+                else:
+                    # Not preloaded (Linux, or a WAV load_wav couldn't decode): same
+                    # players as the motion alert, ending at paplay/afplay/PowerShell
+                    play_file(sound_path)
+            except Exception as e:
+                print(f"[GestureDetector] Error playing sound: {e}")
+    
+    # ==================== MediaPipe Methods ====================
+    
+    def _create_landmarker(
+        self,
+        model_path: str,
+        min_detection_confidence: float,
+        min_tracking_confidence: float
+    ):
+        """
+        Create a Tasks API HandLandmarker, on the GPU delegate if possible.
+        
+        Args:
+            model_path: Path to the hand_landmarker.task model bundle
+            min_detection_confidence: Minimum hand detection confidence
+            min_tracking_confidence: Minimum hand tracking confidence
+            
+        Returns:
+            HandLandmarker, or None if it could not be created on any delegate
+        """
+        for delegate in (mp_tasks.BaseOptions.Delegate.GPU, mp_tasks.BaseOptions.Delegate.CPU):
+            options = mp_vision.HandLandmarkerOptions(
+                base_options=mp_tasks.BaseOptions(model_asset_path=model_path, delegate=delegate),
+                running_mode=mp_vision.RunningMode.VIDEO,
+                num_hands=self.MAX_HANDS,
+                min_hand_detection_confidence=min_detection_confidence,
                 min_tracking_confidence=min_tracking_confidence
             )
-            self._mp_draw = mp.solutions.drawing_utils
+            try:
+                landmarker = mp_vision.HandLandmarker.create_from_options(options)
+            except (RuntimeError, NotImplementedError) as e:
+                print(f"[GestureDetector] HandLandmarker {delegate.name} delegate unavailable: {e}")
+                continue
+            print(f"[GestureDetector] Using HandLandmarker ({delegate.name} delegate)")
+            return landmarker
+        return None
+    
+    def _run_hand_model(self, rgb_frame) -> list:
+        """
+        Run the hand model on an RGB frame.
         
-        # OpenCV fallback: skin color range in HSV
-        self.lower_skin = np.array([0, 20, 70], dtype=np.uint8)
-        self.upper_skin = np.array([20, 255, 255], dtype=np.uint8)
+        Returns:
+            List of NormalizedLandmarkList, one per detected hand
+        """
+        if not self._use_tasks:
+            results = self._hands.process(rgb_frame)
+            return list(results.multi_hand_landmarks or [])
+        
+        # VIDEO mode tracks between frames and needs strictly increasing timestamps
+        self._video_ts = max(self._video_ts + 1, int(time.monotonic() * 1000))
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        result = self._hands.detect_for_video(image, self._video_ts)
+        
+        # Same landmark protos as the solutions API, for classification and drawing
+        return [
+            landmark_pb2.NormalizedLandmarkList(landmark=[
+                landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z) for lm in hand
+            ])
+            for hand in result.hand_landmarks
+        ]
     
-    def _play_sound(self, gesture_name: str):
-        """Play the sound file associated with a gesture."""
-        sound_file = self.GESTURE_SOUNDS.get(gesture_name)
-        if not sound_file:
-            return
+    @staticmethod
+    def _put_latest(q: queue.Queue, item):
+        """
+        Put item on a single-slot queue, replacing anything not yet taken.
         
-        sound_path = os.path.join(SOUNDS_DIR, sound_file)
-        if not os.path.exists(sound_path):
-            print(f"[GestureDetector] Sound file not found: {sound_path}")
+        Returns:
+            The replaced item, or None
+        """
+        replaced = None
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            try:
+                replaced = q.get_nowait()
+            except queue.Empty:
+                pass
+            q.put_nowait(item)
+        return replaced
+    
+    def _submit_mediapipe(self, frame):
+        """Queue a (downscaled) RGB copy of the frame for the inference thread."""
+        if self._is_unchanged(frame):
+            # Same scene as the last inference - its landmarks still apply
+            if self._latest_hands:
+                self._last_hand_time = time.time()
             return
         
+        h, w = frame.shape[:2]
+        if w > self.MEDIAPIPE_MAX_WIDTH:
+            size = (self.MEDIAPIPE_MAX_WIDTH, int(h * self.MEDIAPIPE_MAX_WIDTH / w))
+            if self._mp_small is None or self._mp_small.shape[:2] != (size[1], size[0]):
+                self._mp_small = np.empty((size[1], size[0], 3), np.uint8)
+            frame = cv2.resize(frame, size, dst=self._mp_small, interpolation=cv2.INTER_AREA)
+        
+        # Convert into a buffer the worker doesn't hold (the caller may keep drawing on frame)
         try:
-            if AUDIO_BACKEND == "winsound":
-                winsound.PlaySound(sound_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
-            else:
-                print(f"[GestureDetector] No audio backend to play {sound_file}")
-        except Exception as e:
-            print(f"[GestureDetector] Error playing sound: {e}")
-    
-    # ==================== MediaPipe Methods ====================
-    
-    def _is_finger_extended(self, landmarks, tip_idx: int, pip_idx: int) -> bool:
-        """Check if finger is extended (MediaPipe)."""
-        return landmarks[tip_idx].y < landmarks[pip_idx].y
+            rgb_frame = self._rgb_free.get_nowait()
+        except queue.Empty:
+            rgb_frame = None
+        if rgb_frame is None or rgb_frame.shape != frame.shape:
+            rgb_frame = np.empty_like(frame)
+        rgb_frame.flags.writeable = True
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+        # Read-only lets MediaPipe use the buffer by reference instead of copying it
+        rgb_frame.flags.writeable = False
+        
+        replaced = self._put_latest(self._inq, rgb_frame)
+        if replaced is not None:
+            self._rgb_free.put(replaced)
     
-    def _is_finger_folded(self, landmarks, tip_idx: int, mcp_idx: int) -> bool:
-        """Check if finger is folded (MediaPipe)."""
-        return landmarks[tip_idx].y > landmarks[mcp_idx].y
+    def _inference_loop(self):
+        """Run the hand model on queued frames until close() sends None."""
+        while True:
+            rgb_frame = self._inq.get()
+            if rgb_frame is None:
+                break
+            
+            try:
+                self._latest_hands = self._run_hand_model(rgb_frame)
+            except Exception as e:
+                print(f"[GestureDetector] Inference error: {e}")
+                continue
+            finally:
+                self._rgb_free.put(rgb_frame)
+            
+            self._put_latest(self._outq, self._classify_hands(self._latest_hands))
     
     def _detect_gesture_mediapipe(self, frame) -> Tuple[Optional[str], Optional[object]]:
         """
         Detect gestures using MediaPipe.
         
+        Hands the frame to the inference thread and returns the newest
+        finished result, if any (typically from a slightly earlier frame).
+        
         Returns:
             Tuple of (gesture_name, hand_landmarks) or (None, None)
         """
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self._hands.process(rgb_frame)
+        self._submit_mediapipe(frame)
+        try:
+            return self._outq.get_nowait()
+        except queue.Empty:
+            return None, None
+    
+    def _classify_hands(self, multi_hand_landmarks) -> Tuple[Optional[str], Optional[object]]:
+        """
+        Match MediaPipe hand landmarks against the supported gestures.
         
-        if not results.multi_hand_landmarks:
+        Returns:
+            Tuple of (gesture_name, hand_landmarks) or (None, None)
+        """
+        if not multi_hand_landmarks:
             return None, None
         
-        for hand_landmarks in results.multi_hand_landmarks:
+        self._last_hand_time = time.time()
+        for hand_landmarks in multi_hand_landmarks:
             lm = hand_landmarks.landmark
             
-            # Check finger states
-            # Index finger (tip=8, pip=6)
-            index_extended = self._is_finger_extended(lm, 8, 6)
-            # Middle finger (tip=12, pip=10)
-            middle_extended = self._is_finger_extended(lm, 12, 10)
+            # Finger tips are compared with their pip (extended) or mcp (folded)
+            # joint; checks bail out early since most hands match nothing.
+            # Every gesture needs the middle finger extended (tip=12, pip=10)
+            # and the pinky folded (tip=20, mcp=17)
+            if lm[12].y >= lm[10].y or lm[20].y <= lm[17].y:
+                continue
             # Ring finger (tip=16, pip=14, mcp=13)
-            ring_extended = self._is_finger_extended(lm, 16, 14)
-            ring_folded = self._is_finger_folded(lm, 16, 13)
-            # Pinky finger (tip=20, pip=18, mcp=17)
-            pinky_folded = self._is_finger_folded(lm, 20, 17)
-            # Index folded check
-            index_folded = self._is_finger_folded(lm, 8, 5)
+            ring_folded = lm[16].y > lm[13].y
             
-            # Middle finger gesture: ONLY middle extended, others folded
-            if (middle_extended and 
-                index_folded and 
-                ring_folded and 
-                pinky_folded):
+            # Middle finger gesture: index (tip=8, mcp=5) and ring also folded
+            if ring_folded and lm[8].y > lm[5].y:
                 return "middle", hand_landmarks
             
+            # Three fingers and peace sign both need the index extended (tip=8, pip=6)
+            if lm[8].y >= lm[6].y:
+                continue
+            
             # Three fingers: Index + Middle + Ring extended, Pinky folded
-            if (index_extended and 
-                middle_extended and 
-                ring_extended and 
-                pinky_folded):
+            if lm[16].y < lm[14].y:
                 return "three", hand_landmarks
             
             # Peace sign: Index + Middle extended, Ring + Pinky folded
-            if (index_extended and 
-                middle_extended and 
-                ring_folded and 
-                pinky_folded):
+            if ring_folded:
                 return "peace", hand_landmarks
         
         return None, None
     
     # ==================== OpenCV Fallback Methods ====================
     
-    def _count_fingers_opencv(self, contour) -> int:
+    def _skin_mask(self, frame) -> np.ndarray:
+        """Skin-colored pixels with speckle removed (OpenCV fallback)."""
+        # Flat buffer so crops of any size up to the largest seen can use a
+        # contiguous view of it
+        if self._ycrcb_buf is None or self._ycrcb_buf.size < frame.size:
+            self._ycrcb_buf = np.empty(frame.size, np.uint8)
+        ycrcb = cv2.cvtColor(
+            frame, cv2.COLOR_BGR2YCrCb,
+            dst=self._ycrcb_buf[:frame.size].reshape(frame.shape)
+        )
+        mask = cv2.inRange(ycrcb, self.lower_skin, self.upper_skin)
+        # Opening = erode x2 then dilate x2
+        return cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._morph_kernel, iterations=2)
+    
+    def _count_fingers_opencv(self, contour, hull) -> int:
         """Count fingers using convex hull defects (OpenCV fallback)."""
-        hull = cv2.convexHull(contour, returnPoints=False)
-        
-        if len(hull) < 3:
+        if len(hull) < 3 or len(contour) <= len(hull):
             return 0
         
         try:
             defects = cv2.convexityDefects(contour, hull)
-        except:
+        except cv2.error:
+            # Raised for self-intersecting contours (non-monotonous hull)
             return 0
         
         if defects is None:
             return 0
         
-        finger_count = 0
-        for i in range(defects.shape[0]):
-            s, e, f, d = defects[i, 0]
-            start = tuple(contour[s][0])
-            end = tuple(contour[e][0])
-            far = tuple(contour[f][0])
-            
-            a = np.sqrt((end[0] - start[0])**2 + (end[1] - start[1])**2)
-            b = np.sqrt((far[0] - start[0])**2 + (far[1] - start[1])**2)
-            c = np.sqrt((end[0] - far[0])**2 + (end[1] - far[1])**2)
-            
-            if b * c == 0:
-                continue
-            angle = np.arccos((b**2 + c**2 - a**2) / (2 * b * c))
-            
-            if angle <= np.pi / 2:
-                finger_count += 1
+        # Angle at each defect's far point, for all defects at once. The angle
+        # is <= 90 degrees exactly when its cosine is >= 0, i.e. when
+        # b^2 + c^2 - a^2 >= 0 (law of cosines), so no sqrt/arccos is needed
+        sef = defects.reshape(-1, 4)[:, :3]
+        pts = contour.reshape(-1, 2).astype(np.int64)
+        start, end, far = pts[sef[:, 0]], pts[sef[:, 1]], pts[sef[:, 2]]
+        a2 = ((end - start) ** 2).sum(axis=1)
+        b2 = ((far - start) ** 2).sum(axis=1)
+        c2 = ((end - far) ** 2).sum(axis=1)
+        valid = (b2 > 0) & (c2 > 0)
+        finger_count = int((valid & (b2 + c2 >= a2)).sum())
         
         return finger_count + 1
     
+    # ==================== Idle Gate ====================
+    
+    def _passes_idle_gate(self, frame) -> bool:
+        """
+        Cheap pre-filter run on idle frames before the full detector.
+        
+        Compares a tiny grayscale copy against a slowly updated background;
+        the OpenCV fallback also requires some skin-colored pixels.
+        
+        Returns:
+            True if the frame is worth running full detection on
+        """
+        small = cv2.resize(frame, self.GATE_SIZE, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        
+        if self._bg is None:
+            # Nothing to compare against yet - analyse the first frame in full, so
+            # a hand already in view when detection starts isn't mistaken for background
+            self._bg = gray
+            return True
+        
+        diff = cv2.absdiff(gray, self._bg)
+        self._bg = cv2.addWeighted(self._bg, 0.9, gray, 0.1, 0)
+        changed = cv2.threshold(diff, self.GATE_PIXEL_DIFF, 255, cv2.THRESH_BINARY)[1]
+        if cv2.countNonZero(changed) < self.GATE_MIN_PIXELS:
+            return False
+        
+        if not self._use_mediapipe:
+            # Not enough skin at gate size to reach min_hand_area at full size
+            ycrcb = cv2.cvtColor(small, cv2.COLOR_BGR2YCrCb)
+            skin_pixels = cv2.countNonZero(cv2.inRange(ycrcb, self.lower_skin, self.upper_skin))
+            scale = (frame.shape[0] * frame.shape[1]) / (self.GATE_SIZE[0] * self.GATE_SIZE[1])
+            if skin_pixels * scale < self.min_hand_area:
+                return False
+            
+            # Search for the hand around what changed
+            x, y, w, h = cv2.boundingRect(changed)
+            sx = frame.shape[1] / self.GATE_SIZE[0]
+            sy = frame.shape[0] / self.GATE_SIZE[1]
+            self._roi = self._expand_roi(frame, x * sx, y * sy, w * sx, h * sy)
+        
+        return True
+    
+    def _is_unchanged(self, frame) -> bool:
+        """
+        Check whether a frame looks the same as the last analysed one.
+        
+        Uses the idle gate's test at GATE_SIZE; the reference only moves
+        when a frame counts as changed, so slow drift still adds up.
+        
+        Returns:
+            True if the previous detection result can be reused
+        """
+        small = cv2.resize(frame, self.GATE_SIZE, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        
+        if self._analysed_gray is not None:
+            diff = cv2.absdiff(gray, self._analysed_gray)
+            changed = cv2.threshold(diff, self.GATE_PIXEL_DIFF, 255, cv2.THRESH_BINARY)[1]
+            if cv2.countNonZero(changed) < self.GATE_MIN_PIXELS:
+                return True
+        
+        self._analysed_gray = gray
+        return False
+    
     # ==================== Public API ====================
     
-    def detect_gesture(self, frame) -> Tuple[Optional[str], Optional[object]]:
+    def detect_gesture(self, frame) -> Tuple[Optional[str], list]:
         """
-        Detect any supported gesture in the frame.
+        Detect any supported gesture in the frame, along with every hand in it.
+        
+        Frames skipped while idle (or while every gesture is cooling down)
+        report no hands, so drawing them costs nothing extra.
         
         Returns:
-            Tuple of (gesture_name, landmarks/mask) or (None, None)
+            Tuple of (gesture_name or None, list of landmarks/HandOutline for drawing)
             gesture_name can be: "peace", "three", "middle"
         """
         current_time = time.time()
         
+        # Nothing can trigger while every gesture is cooling down
+        if all(current_time - t < self.cooldown_sec for t in self._last_gesture_time.values()):
+            return None, []
+        
+        # No hand recently - skip frames instead of running detection on each one
+        self._frame_index += 1
+        idle = current_time - self._last_hand_time > self.IDLE_AFTER_SEC
+        if idle and (self._frame_index % self.IDLE_FRAME_SKIP or not self._passes_idle_gate(frame)):
+            return None, []
+        
         if self._use_mediapipe:
-            gesture, data = self._detect_gesture_mediapipe(frame)
+            gesture, _ = self._detect_gesture_mediapipe(frame)
+            hands = self._latest_hands
         else:
             # OpenCV fallback - count fingers
-            gesture, data = self._detect_gesture_opencv(frame)
+            gesture, hand = self._detect_gesture_opencv(frame)
+            hands = [hand] if hand is not None else []
         
         if gesture:
             # Check cooldown for this specific gesture
             if current_time - self._last_gesture_time[gesture] < self.cooldown_sec:
-                return None, data  # Still return data for drawing
+                return None, hands  # Still return hands for drawing
             
             # Gesture detected and not on cooldown
             self._last_gesture_time[gesture] = current_time
             self._play_sound(gesture)
-            return gesture, data
+            return gesture, hands
         
-        return None, data
+        return None, hands
     
     def detect_peace_sign(self, frame) -> Tuple[bool, Optional[object]]:
         """
         Legacy method - detect peace sign gesture.
         
         Returns:
-            Tuple of (detected: bool, landmarks/mask for drawing)
+            Tuple of (detected: bool, first hand's landmarks/HandOutline for drawing, or None)
         """
-        gesture, data = self.detect_gesture(frame)
-        return gesture == "peace", data
+        gesture, hands = self.detect_gesture(frame)
+        return gesture == "peace", hands[0] if hands else None
     
-    def _detect_gesture_opencv(self, frame) -> Tuple[Optional[str], Optional[np.ndarray]]:
-        """Detect gestures using OpenCV skin detection (fallback)."""
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        mask = cv2.inRange(hsv, self.lower_skin, self.upper_skin)
+    def _hand_contour(self, mask, scale: float) -> Optional[np.ndarray]:
+        """
+        Find the largest skin contour in a mask.
         
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (11, 11))
-        mask = cv2.erode(mask, kernel, iterations=2)
-        mask = cv2.dilate(mask, kernel, iterations=2)
-        mask = cv2.GaussianBlur(mask, (3, 3), 0)
+        Args:
+            mask: Skin mask at analysis scale
+            scale: Factor from analysis scale back to frame resolution
+            
+        Returns:
+            Contour at analysis scale, or None if no region reaches min_hand_area
+        """
+        # Only the largest outer contour is used, so skip building the hierarchy
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_KCOS)
+        if not contours:
+            return None
         
-        contours, _ = cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        # Each area is computed once, including the winner's
+        areas = [cv2.contourArea(c) for c in contours]
+        idx = int(np.argmax(areas))
+        if areas[idx] * scale * scale < self.min_hand_area:
+            return None
         
-        if not contours:
-            return None, mask
+        return contours[idx]
+    
+    def _expand_roi(self, frame, x: float, y: float, w: float, h: float) -> Tuple[int, int, int, int]:
+        """Grow a box by ROI_MARGIN on each side, clipped to the frame, as (x0, y0, x1, y1)."""
+        frame_h, frame_w = frame.shape[:2]
+        mx, my = w * self.ROI_MARGIN, h * self.ROI_MARGIN
+        return (
+            max(0, int(x - mx)), max(0, int(y - my)),
+            min(frame_w, int(x + w + mx)), min(frame_h, int(y + h + my))
+        )
+    
+    def _find_hand(self, frame) -> Optional[HandOutline]:
+        """
+        Find the hand outline in a frame (OpenCV fallback).
+        
+        Only the current search region is examined; the next region is set
+        around the hand found, or reset to the whole frame if none was.
+        
+        Returns:
+            HandOutline, or None if no large enough skin region was found
+        """
+        if self._is_unchanged(frame):
+            # Same scene as the last analysed frame - reuse its outline (and search region)
+            if self._last_outline is not None:
+                self._last_hand_time = time.time()
+            return self._last_outline
+        
+        hand = None
+        x0, y0, x1, y1 = self._roi or (0, 0, frame.shape[1], frame.shape[0])
+        self._roi = None
+        
+        # Downscale the search region to OPENCV_MAX_WIDTH density before any
+        # per-pixel work; the same factor on both axes keeps finger angles intact
+        region = frame[y0:y1, x0:x1]
+        scale = max(1.0, frame.shape[1] / self.OPENCV_MAX_WIDTH)
+        if scale > 1.0:
+            region = cv2.resize(
+                region, (max(1, round((x1 - x0) / scale)), max(1, round((y1 - y0) / scale))),
+                interpolation=cv2.INTER_AREA
+            )
         
-        max_contour = max(contours, key=cv2.contourArea)
-        if cv2.contourArea(max_contour) < self.min_hand_area:
-            return None, mask
+        contour = self._hand_contour(self._skin_mask(region), scale)
+        if contour is not None:
+            self._last_hand_time = time.time()
+            hand = HandOutline(contour, cv2.convexHull(contour, returnPoints=False), scale, (x0, y0))
+            bx, by, bw, bh = cv2.boundingRect(contour)
+            self._roi = self._expand_roi(frame, x0 + bx * scale, y0 + by * scale, bw * scale, bh * scale)
+        
+        self._last_outline = hand
+        return hand
+    
+    def _detect_gesture_opencv(self, frame) -> Tuple[Optional[str], Optional[HandOutline]]:
+        """Detect gestures using OpenCV skin detection (fallback)."""
+        hand = self._find_hand(frame)
+        if hand is None:
+            return None, None
         
-        finger_count = self._count_fingers_opencv(max_contour)
+        finger_count = self._count_fingers_opencv(hand.contour, hand.hull)
         
         # Map finger count to gesture
         if finger_count == 1:
-            return "middle", mask
+            return "middle", hand
         elif finger_count == 2:
-            return "peace", mask
+            return "peace", hand
         elif finger_count == 3:
-            return "three", mask
+            return "three", hand
         
-        return None, mask
+        return None, hand
     
     def draw_landmarks(self, frame, data):
         """Draw detection visualization on the frame."""
@@ -295,14 +699,10 @@ class GestureDetector:
         if self._use_mediapipe:
             self._mp_draw.draw_landmarks(frame, data, self._mp_hands.HAND_CONNECTIONS)
         else:
-            # OpenCV: draw contours
-            contours, _ = cv2.findContours(data, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-            if contours:
-                max_contour = max(contours, key=cv2.contourArea)
-                if cv2.contourArea(max_contour) > self.min_hand_area:
-                    cv2.drawContours(frame, [max_contour], -1, (0, 255, 0), 2)
-                    hull = cv2.convexHull(max_contour)
-                    cv2.drawContours(frame, [hull], -1, (255, 0, 0), 2)
+            # OpenCV: draw the outline and hull found during detection
+            contour = (data.contour * data.scale + data.offset).astype(np.int32)
+            cv2.drawContours(frame, [contour], -1, (0, 255, 0), 2)
+            cv2.drawContours(frame, [contour[data.hull[:, 0]]], -1, (255, 0, 0), 2)
         
         return frame
     
@@ -310,28 +710,25 @@ class GestureDetector:
         """
         Get hand landmarks for drawing (always, regardless of gesture).
         
+        Thin wrapper around detect_gesture(), so it also triggers gesture
+        sounds; callers that want the gesture too should use detect_gesture().
+        
         Returns:
             List of hand landmarks if hands detected, empty list otherwise.
         """
-        if not self._use_mediapipe:
-            # OpenCV fallback: return skin mask
-            hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-            mask = cv2.inRange(hsv, self.lower_skin, self.upper_skin)
-            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (11, 11))
-            mask = cv2.erode(mask, kernel, iterations=2)
-            mask = cv2.dilate(mask, kernel, iterations=2)
-            return [mask] if np.sum(mask) > 0 else []
-        
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self._hands.process(rgb_frame)
-        
-        if results.multi_hand_landmarks:
-            return list(results.multi_hand_landmarks)
-        return []
+        return self.detect_gesture(frame)[1]
     
     def close(self):
         """Release resources."""
+        if self._audio_worker is not None:
+            self._put_latest(self._audio_q, None)
+            self._audio_worker.join(timeout=2.0)
+            self._audio_worker = None
+        
         if self._hands:
+            # Stop the inference thread before closing the model it uses
+            self._put_latest(self._inq, None)
+            self._worker.join(timeout=2.0)
             self._hands.close()
             self._hands = None
 
@@ -347,10 +744,17 @@ if __name__ == "__main__":
     
     detector = GestureDetector(cooldown_sec=15.0)
     
-    cap = cv2.VideoCapture(0)
+    # V4L2 directly on Linux (the Pi); the default backend elsewhere
+    if sys.platform.startswith("linux"):
+        cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
+    else:
+        cap = cv2.VideoCapture(0)
     if not cap.isOpened():
         print("ERROR: Could not open camera!")
         exit(1)
+    # Compressed capture and a single queued frame, so gestures aren't judged on stale frames
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
     
     print("Camera opened. Try these gestures:")
     print("  ✌️  Peace sign (2 fingers) -> john.wav (friend)")
@@ -373,14 +777,11 @@ if __name__ == "__main__":
             
             frame = cv2.flip(frame, 1)
             
-            # Always get and draw hand landmarks
-            hand_landmarks = detector.get_hand_landmarks(frame)
+            # Check for gestures; hand landmarks are always drawn
+            gesture, hand_landmarks = detector.detect_gesture(frame)
             for hand_data in hand_landmarks:
                 detector.draw_landmarks(frame, hand_data)
             
-            # Check for gestures
-            gesture, _ = detector.detect_gesture(frame)
-            
             if gesture:
                 gesture_counts[gesture] += 1
                 emoji = {"peace": "✌️", "three": "🤟", "middle": "🖕"}[gesture]
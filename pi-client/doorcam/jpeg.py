@@ -0,0 +1,40 @@
+"""
+JPEG Encoding Module
+
+Encodes camera frames to JPEG using libjpeg-turbo (PyTurboJPEG, SIMD/NEON
+accelerated) when available, falling back to OpenCV's encoder.
+"""
+
+import cv2
+import numpy as np
+from typing import Optional
+
+# Try to load libjpeg-turbo (needs the PyTurboJPEG package and libturbojpeg)
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    _turbo = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+except (ImportError, OSError, RuntimeError):
+    _turbo = None
+    TURBOJPEG_AVAILABLE = False
+
+
+def encode_jpeg(frame: np.ndarray, quality: int = 95) -> Optional[bytes]:
+    """
+    Encode a BGR frame as JPEG.
+
+    Args:
+        frame: Frame as numpy array (BGR)
+        quality: JPEG quality (1-100)
+
+    Returns:
+        JPEG bytes, or None if encoding failed
+    """
+    if _turbo is not None:
+        # 4:2:0 subsampling matches OpenCV's default output
+        return _turbo.encode(frame, quality=quality, pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420)
+
+    ret, jpeg_data = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ret:
+        return None
+    return jpeg_data.tobytes()
@@ -6,7 +6,9 @@ Plays an optional audio alert and pops up a minimal preview window.
 """
 
 import cv2
+import numpy as np
 import time
+import queue
 import threading
 from pathlib import Path
 from . import config
@@ -15,6 +17,105 @@ from .camera_motion import CameraMotionDetector
 from .audio import play_audio
 from .audio_relay import AudioRelay
 from .gesture_detector import GestureDetector
+from .jpeg import encode_jpeg
+
+
+def _poll_key() -> int:
+    """Return the key pressed since the last call (0xFF if none) without waiting."""
+    # pollKey (OpenCV >= 4.5) handles GUI events without waitKey's minimum 1 ms sleep
+    if hasattr(cv2, "pollKey"):
+        return cv2.pollKey() & 0xFF
+    return cv2.waitKey(1) & 0xFF
+
+
+class _GestureWorker:
+    """
+    Runs gesture detection on a background thread.
+    
+    The display loop hands over frames with submit() (the newest replaces one
+    the worker hasn't taken yet) and draws the hands from the newest finished
+    detection, read with hands(). reset() ends a session: detections still
+    running on its frames are discarded, so the next session starts clean.
+    """
+    
+    def __init__(self, detector: GestureDetector, on_gesture=None):
+        """
+        Args:
+            detector: GestureDetector to run (it plays gesture sounds itself)
+            on_gesture: Called on the worker thread with each gesture name detected
+        """
+        self.detector = detector
+        self.on_gesture = on_gesture
+        self._frames = queue.Queue(maxsize=1)
+        self._lock = threading.Lock()
+        self._session = 0  # Bumped by reset(); frames are tagged with it
+        self._hands = []
+        self._thread = None
+    
+    def start(self):
+        """Start the worker thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Stop the worker thread."""
+        if self._thread is not None:
+            self._put((None, None))
+            self._thread.join(timeout=2.0)
+            self._thread = None
+    
+    def submit(self, frame):
+        """Hand a frame (the worker keeps a reference, so pass a copy) to the worker."""
+        with self._lock:
+            session = self._session
+        self._put((session, frame))
+    
+    def hands(self) -> list:
+        """Hands from the newest finished detection in the current session."""
+        with self._lock:
+            return self._hands
+    
+    def reset(self):
+        """Drop the current session's results and any frame not yet taken."""
+        with self._lock:
+            self._session += 1
+            self._hands = []
+        try:
+            self._frames.get_nowait()
+        except queue.Empty:
+            pass
+    
+    def _put(self, item):
+        """Queue an item, replacing one the worker hasn't taken yet."""
+        try:
+            self._frames.put_nowait(item)
+        except queue.Full:
+            try:
+                self._frames.get_nowait()
+            except queue.Empty:
+                pass
+            self._frames.put_nowait(item)
+    
+    def _loop(self):
+        """Detect gestures on submitted frames until stop()."""
+        while True:
+            session, frame = self._frames.get()
+            if frame is None:
+                break
+            
+            try:
+                gesture, hands = self.detector.detect_gesture(frame)
+            except Exception as e:
+                print(f"[Gesture] Detection error: {e}")
+                continue
+            
+            with self._lock:
+                if session != self._session:
+                    continue  # Session ended while this frame was being analysed
+                self._hands = hands
+            if gesture and self.on_gesture is not None:
+                self.on_gesture(gesture)
 
 
 class LiveCameraDisplay:
@@ -25,6 +126,7 @@ class LiveCameraDisplay:
     - Minimal "LIVE" indicator in corner
     - Optional audio alert on popup
     - Auto-hides after configurable timeout
+    - Optional gesture detection on a worker thread (hand overlay on the feed)
     """
     
     def __init__(
@@ -32,7 +134,8 @@ class LiveCameraDisplay:
         camera: CameraManager = None,
         display_duration_sec: float = 10.0,
         audio_file: str = None,
-        window_name: str = "Doorbell Camera"
+        window_name: str = "Doorbell Camera",
+        gesture_detector: GestureDetector = None
     ):
         """
         Initialize live camera display.
@@ -42,6 +145,8 @@ class LiveCameraDisplay:
             display_duration_sec: How long to show the preview
             audio_file: Path to audio file to play (uses config if not provided)
             window_name: Name of the display window
+            gesture_detector: If given, frames shown are also checked for
+                gestures on a worker thread so detection never stalls the display
         """
         self.camera = camera or CameraManager()
         self.display_duration_sec = display_duration_sec
@@ -51,6 +156,15 @@ class LiveCameraDisplay:
         self._showing = False
         self._show_until = 0
         self._lock = threading.Lock()
+        self._wake = threading.Event()  # Set by trigger() to wake the idle display loop
+        
+        # Gesture worker: newest frame in, newest hand data out
+        self.gesture_detector = gesture_detector
+        self._gestures = None
+        if gesture_detector is not None:
+            self._gestures = _GestureWorker(
+                gesture_detector, on_gesture=lambda g: print(f"[LiveDisplay] Gesture: {g}")
+            )
     
     def _draw_live_indicator(self, frame):
         """Draw a minimal LIVE indicator in the corner."""
@@ -75,6 +189,7 @@ class LiveCameraDisplay:
         """Trigger the camera display (called on motion detection)."""
         with self._lock:
             self._show_until = time.time() + self.display_duration_sec
+            self._wake.set()
             
             if not self._showing:
                 self._showing = True
@@ -96,7 +211,15 @@ class LiveCameraDisplay:
         print(f"[LiveDisplay] Ready. Window: '{self.window_name}'")
         print("[LiveDisplay] Press 'q' to quit")
         
-        window_created = False
+        # Created once and kept; when idle it shows a black frame instead of being
+        # destroyed, which avoids a compositor round-trip on every trigger
+        cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(self.window_name, self.camera.width, self.camera.height)
+        blank = np.zeros((self.camera.height, self.camera.width, 3), dtype=np.uint8)
+        cv2.imshow(self.window_name, blank)
+        
+        if self._gestures is not None:
+            self._gestures.start()
         
         try:
             while True:
@@ -106,40 +229,46 @@ class LiveCameraDisplay:
                     should_show = current_time < self._show_until
                 
                 if should_show:
-                    # Create window if not exists
-                    if not window_created:
-                        cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
-                        cv2.resizeWindow(self.window_name, self.camera.width, self.camera.height)
-                        window_created = True
-                    
                     # Read and display frame
                     frame = self.camera.read_frame()
                     if frame is not None:
-                        # Add only the LIVE indicator
+                        if self._gestures is not None:
+                            # The worker gets its own copy; overlays are drawn on this one.
+                            # Hands drawn are from the newest finished detection.
+                            self._gestures.submit(frame.copy())
+                            for hd in self._gestures.hands():
+                                self.gesture_detector.draw_landmarks(frame, hd)
+                        
+                        # Add the LIVE indicator
                         frame = self._draw_live_indicator(frame)
                         cv2.imshow(self.window_name, frame)
                     
                     # Check for 'q' key
-                    key = cv2.waitKey(1) & 0xFF
+                    key = _poll_key()
                     if key == ord('q'):
                         break
                 else:
-                    # Hide window when not showing
-                    if window_created:
-                        cv2.destroyWindow(self.window_name)
-                        window_created = False
-                        with self._lock:
-                            self._showing = False
+                    # Blank the window when the show period ends
+                    with self._lock:
+                        was_showing = self._showing
+                        self._showing = False
+                    if was_showing:
+                        cv2.imshow(self.window_name, blank)
+                        if self._gestures is not None:
+                            self._gestures.reset()
                     
-                    # Sleep to reduce CPU usage when not displaying
-                    time.sleep(0.1)
+                    # Idle until trigger() (or a periodic check) instead of polling
+                    self._wake.wait(timeout=1.0)
+                    self._wake.clear()
                     
                     # Still check for quit
-                    key = cv2.waitKey(1) & 0xFF
+                    key = _poll_key()
                     if key == ord('q'):
                         break
         
         finally:
+            if self._gestures is not None:
+                self._gestures.stop()
             cv2.destroyAllWindows()
             self.camera.close()
     
@@ -164,8 +293,9 @@ def run_motion_triggered_display(
     Window closes after exactly 15 seconds (hard timer).
     """
     import os
-    import base64
+    import random
     import signal
+    from concurrent.futures import ThreadPoolExecutor
     
     # Handle Ctrl+C properly
     running = [True]  # Use list to allow modification in signal handler
@@ -180,26 +310,35 @@ def run_motion_triggered_display(
         print("[Warning] requests not installed - snapshot upload disabled")
         requests = None
     
+    # One session for all uploads, so the connection (and TLS, e.g. through ngrok)
+    # to the backend is reused across snapshots
+    http = requests.Session() if requests is not None else None
+    # Uploads run on a small long-lived pool instead of a new thread per snapshot
+    upload_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="upload")
+    
     backend = backend_url or os.getenv("BACKEND_URL", "http://localhost:8000")
+    # Built once; every upload sends the same URL and headers (the ngrok one skips its warning page)
+    ingest_url = f"{backend}/v1/events/ingest"
+    upload_headers = {
+        "Content-Type": "image/jpeg",
+        "ngrok-skip-browser-warning": "true"
+    }
     
     print("=" * 60)
     print("Motion-Triggered Camera Display")
     print("=" * 60)
     print()
     
-    # Open camera ONCE
+    # Open camera ONCE; frames are read on CameraManager's capture thread
+    # (newest frames kept), so the loop below never waits on the device
     print("[Setup] Opening camera...")
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
-        cap = cv2.VideoCapture(1)
-        if not cap.isOpened():
+    camera = CameraManager(device="0", width=640, height=480)
+    if not camera.start_capture():
+        camera = CameraManager(device="1", width=640, height=480)
+        if not camera.start_capture():
             print("[ERROR] Could not open camera!")
             return
     
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    print(f"[Setup] Camera opened: {int(cap.get(3))}x{int(cap.get(4))}")
-    
     # State variables
     motion_start_time = 0  # When motion started (for hard 15s timer)
     snapshot_at = 0
@@ -219,6 +358,18 @@ def run_motion_triggered_display(
     gesture_detector = GestureDetector(cooldown_sec=15.0)
     gesture_counts = {"peace": 0, "three": 0, "middle": 0}
     
+    def on_gesture(gesture):
+        """Count and announce a detected gesture (runs on the gesture worker)."""
+        gesture_counts[gesture] += 1
+        emoji = {"peace": "✌️", "three": "🤟", "middle": "🖕"}.get(gesture, "")
+        name = {"peace": "FRIEND (John)", "three": "THREE (Gerbert)", "middle": "ENEMY!"}.get(gesture, gesture)
+        print(f"[Gesture #{sum(gesture_counts.values())}] {name} {emoji}")
+    
+    # Gestures are detected on a worker thread during a session; the loop hands it
+    # frame copies and draws the newest hands it found
+    gestures = _GestureWorker(gesture_detector, on_gesture=on_gesture)
+    gestures.start()
+    
     print(f"[Setup] Backend: {backend}")
     print(f"[Setup] Display duration: {display_duration}s (hard close)")
     print(f"[Setup] Snapshot at: {snapshot_delay}s after motion")
@@ -230,51 +381,77 @@ def run_motion_triggered_display(
     
     window_open = False
     
+    # Motion is diffed on a downscaled copy; the full frame is kept for display and snapshots
+    motion_size = (320, 240)
+    motion_check_hz = 10  # Person-scale motion doesn't need every camera frame
+    next_motion_check = 0
+    
+    # Motion scratch buffers, reused via dst= every frame
+    motion_shape = (motion_size[1], motion_size[0])
+    small_buf = np.empty(motion_shape + (3,), np.uint8)
+    gray_buf = np.empty(motion_shape, np.uint8)
+    blurred_bufs = [np.empty(motion_shape, np.uint8), np.empty(motion_shape, np.uint8)]  # current/previous, alternating
+    blurred_ix = 0
+    diff_buf = np.empty(motion_shape, np.uint8)
+    thresh_buf = np.empty(motion_shape, np.uint8)
+    
+    def post_with_retry(url, attempts=4, **kwargs):
+        """
+        POST to the backend, retrying transient failures with jittered exponential backoff.
+        
+        Only failures where the request most likely never reached the backend
+        are retried (connection errors, 502/503 from the tunnel); a repeated
+        ingest after a read timeout could create a duplicate event.
+        
+        Args:
+            url: Request URL
+            attempts: Maximum number of tries
+            **kwargs: Passed through to Session.post
+            
+        Returns:
+            The last response (raises the last connection error if every try failed)
+        """
+        for attempt in range(attempts):
+            last_try = attempt == attempts - 1
+            try:
+                resp = http.post(url, **kwargs)
+                if resp.status_code not in (502, 503) or last_try:
+                    return resp
+                reason = f"HTTP {resp.status_code}"
+            except requests.ConnectionError as e:
+                if last_try:
+                    raise
+                reason = e
+            # 0.3s, 0.6s, 1.2s... plus jitter so clients don't retry in lockstep
+            delay = min(0.3 * 2 ** attempt, 5.0) + random.uniform(0, 0.2)
+            print(f"[Upload] {reason} - retrying in {delay:.1f}s")
+            time.sleep(delay)
+    
     def upload_snapshot(frame_data):
         """Upload snapshot to backend."""
         try:
-            # Encode frame as JPEG
-            _, jpeg = cv2.imencode('.jpg', frame_data, [cv2.IMWRITE_JPEG_QUALITY, 85])
-            b64_data = base64.b64encode(jpeg.tobytes()).decode('utf-8')
-            
-            # Headers to bypass ngrok warning page
-            headers = {
-                "Content-Type": "application/json",
-                "ngrok-skip-browser-warning": "true"
-            }
-            
-            # Create event
-            resp = requests.post(
-                f"{backend}/v1/events/start",
-                headers=headers,
-                timeout=10
-            )
-            if resp.status_code != 200:
-                print(f"[Upload] Failed to create event: {resp.status_code} - {resp.text[:100]}")
+            # Encode frame as JPEG (libjpeg-turbo when available)
+            jpeg = encode_jpeg(frame_data, 85)
+            if jpeg is None:
+                print("[Upload] Failed to encode JPEG")
                 return
             
-            event_id = resp.json().get("event_id")
-            print(f"[Upload] Event created: {event_id}")
-            
-            # Upload base64
-            resp = requests.post(
-                f"{backend}/v1/events/{event_id}/upload-base64",
-                json={"image_data": b64_data},
-                headers=headers,
-                timeout=30
-            )
+            # Create the event and upload the raw JPEG in a single request
+            resp = post_with_retry(ingest_url, data=jpeg, headers=upload_headers, timeout=30)
             if resp.status_code == 200:
+                event_id = resp.json().get("event_id")
+                print(f"[Upload] Event created: {event_id}")
                 print(f"[Upload] Snapshot uploaded successfully!")
             else:
-                print(f"[Upload] Upload failed: {resp.status_code}")
+                print(f"[Upload] Upload failed: {resp.status_code} - {resp.text[:100]}")
         except Exception as e:
             print(f"[Upload] Error: {e}")
     
     try:
         while running[0]:
-            ret, frame = cap.read()
-            if not ret:
-                time.sleep(0.1)
+            # Newest frame only - a slow iteration skips ahead instead of lagging behind
+            frame = camera.get_latest_frame(timeout=1.0)
+            if frame is None:
                 continue
             
             current_time = time.time()
@@ -283,13 +460,13 @@ def run_motion_triggered_display(
             is_paused = current_time < pause_until
             if is_paused:
                 pause_remaining = int(pause_until - current_time)
-                # Show pause status
-                h, w = frame.shape[:2]
+                # Show pause status - nothing is detected while paused, so the
+                # view and the keys are only refreshed twice a second
                 cv2.putText(frame, f"PAUSED ({pause_remaining}s)", (10, 30), 
                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
                 cv2.imshow("Doorbell Camera", frame)
                 
-                key = cv2.waitKey(30) & 0xFF
+                key = cv2.waitKey(500) & 0xFF
                 if key == ord('q'):
                     break
                 elif key == ord('f'):
@@ -302,18 +479,24 @@ def run_motion_triggered_display(
             time_since_motion = current_time - motion_start_time if motion_start_time > 0 else 0
             session_should_end = in_motion_session and time_since_motion >= display_duration
             
-            # Motion detection (only when not in a session)
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.GaussianBlur(gray, (21, 21), 0)
-            
-            if prev_frame is not None and not in_motion_session:
-                diff = cv2.absdiff(prev_frame, gray)
-                thresh = cv2.threshold(diff, sensitivity, 255, cv2.THRESH_BINARY)[1]
-                thresh = cv2.dilate(thresh, None, iterations=2)
-                contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # Motion detection (only when not in a session), sampled at motion_check_hz -
+            # frames are still read every iteration so the camera queue stays fresh
+            if not in_motion_session and current_time >= next_motion_check:
+                next_motion_check = current_time + 1.0 / motion_check_hz
+                cv2.resize(frame, motion_size, dst=small_buf, interpolation=cv2.INTER_AREA)
+                cv2.cvtColor(small_buf, cv2.COLOR_BGR2GRAY, dst=gray_buf)
+                gray = blurred_bufs[blurred_ix]
+                blurred_ix ^= 1
+                cv2.blur(gray_buf, (5, 5), dst=gray)  # Box blur, as in CameraMotionDetector - enough to tame sensor noise
                 
-                for contour in contours:
-                    if cv2.contourArea(contour) > min_area:
+                if prev_frame is not None:
+                    cv2.absdiff(prev_frame, gray, dst=diff_buf)
+                    cv2.threshold(diff_buf, sensitivity, 255, cv2.THRESH_BINARY, dst=thresh_buf)
+                    thresh = cv2.dilate(thresh_buf, None, dst=thresh_buf, iterations=2)
+                    
+                    # Changed area (min_area is in full-frame pixels)
+                    small_min_area = min_area * (motion_size[0] * motion_size[1]) / (frame.shape[0] * frame.shape[1])
+                    if cv2.countNonZero(thresh) > small_min_area:
                         motion_count += 1
                         motion_start_time = current_time
                         snapshot_at = current_time + snapshot_delay
@@ -323,23 +506,13 @@ def run_motion_triggered_display(
                         print(f"[Motion #{motion_count}] Detected! Window opens for {display_duration}s")
                         if audio:
                             play_audio(audio)
-                        break
-            
-            prev_frame = gray
+                
+                prev_frame = gray
             
             # Gesture detection - check for all gestures (peace, three fingers, middle)
-            # detect_gesture() automatically plays the associated sound file
             if in_motion_session:
-                gesture, hand_landmarks = gesture_detector.detect_gesture(frame)
-                if gesture:
-                    gesture_counts[gesture] += 1
-                    emoji = {"peace": "✌️", "three": "🤟", "middle": "🖕"}.get(gesture, "")
-                    name = {"peace": "FRIEND (John)", "three": "THREE (Gerbert)", "middle": "ENEMY!"}.get(gesture, gesture)
-                    print(f"[Gesture #{sum(gesture_counts.values())}] {name} {emoji}")
-                
-                # Always draw hand wireframe if visible
-                hand_data = gesture_detector.get_hand_landmarks(frame)
-                for hd in hand_data:
+                gestures.submit(frame.copy())
+                for hd in gestures.hands():
                     gesture_detector.draw_landmarks(frame, hd)
             
             # Start audio relay 5s after motion detected
@@ -352,7 +525,7 @@ def run_motion_triggered_display(
             if in_motion_session and not snapshot_taken and current_time >= snapshot_at:
                 snapshot_taken = True
                 print("[Capture] Taking snapshot...")
-                threading.Thread(target=upload_snapshot, args=(frame.copy(),), daemon=True).start()
+                upload_pool.submit(upload_snapshot, frame.copy())
             
             # Display logic
             if in_motion_session and not session_should_end:
@@ -375,6 +548,9 @@ def run_motion_triggered_display(
                 # Hard close after 15 seconds
                 if window_open:
                     cv2.destroyWindow("Doorbell Camera")
+                    # GTK/X11 only removes the window once events are pumped; the
+                    # loop below stops pumping while it's closed, so do it now
+                    _poll_key()
                     window_open = False
                     print(f"[Session] Window closed after {display_duration}s")
                 # Stop audio relay
@@ -383,21 +559,30 @@ def run_motion_triggered_display(
                 relay_start_at = 0
                 in_motion_session = False
                 motion_start_time = 0
+                gestures.reset()  # Results still in flight belong to this session
+                prev_frame = None  # Not updated during the session
             
-            key = cv2.waitKey(30) & 0xFF
+            # Keys can only arrive through the window; with it closed, skip the
+            # HighGUI event pump. get_frame() already paces the loop to the camera.
+            if not window_open:
+                continue
+            
+            key = _poll_key()
             if key == ord('q'):
                 break
             elif key == ord('f'):
                 pause_until = current_time + 60
                 print("[Pause] Detection paused for 60 seconds (press 'f' again to cancel)")
-                if not window_open:
-                    cv2.namedWindow("Doorbell Camera", cv2.WINDOW_NORMAL)
-                    window_open = True
     
     finally:
         audio_relay.stop()  # Stop audio relay if running
+        gestures.stop()
         gesture_detector.close()  # Release gesture detector resources
-        cap.release()
+        camera.close()
+        # Let an upload in flight finish (bounded by its timeouts); drop queued ones
+        upload_pool.shutdown(wait=False, cancel_futures=True)
+        if http is not None:
+            http.close()
         cv2.destroyAllWindows()
         print(f"\n[Done] Total motion events: {motion_count}")
         print(f"[Done] Gesture counts: {gesture_counts}")
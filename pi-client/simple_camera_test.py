@@ -1,5 +1,6 @@
 """Simple camera test - no imports from doorcam package"""
 import cv2
+import sys
 import time
 
 print("=" * 50)
@@ -7,12 +8,31 @@ print("Simple Camera Test")
 print("=" * 50)
 
 print("\n[1] Opening camera...")
-cap = cv2.VideoCapture(0)
+# V4L2 directly on Linux (the Pi); the default backend elsewhere
+if sys.platform.startswith("linux"):
+    cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
+else:
+    cap = cv2.VideoCapture(0)
 
 if not cap.isOpened():
     print("ERROR: Camera not found!")
     exit(1)
 
+# MJPEG keeps USB bandwidth down and skips the driver's YUYV conversion;
+# a single queued frame keeps the preview current
+cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+# Preview doesn't need the full frame rate; pace the loop instead of spinning
+TARGET_FPS = 15
+cap.set(cv2.CAP_PROP_FPS, TARGET_FPS)
+frame_interval = 1.0 / TARGET_FPS
+
+# pollKey (OpenCV >= 4.5) pumps GUI events without waitKey's 1 ms sleep
+poll_key = cv2.pollKey if hasattr(cv2, "pollKey") else (lambda: cv2.waitKey(1))
+
 print("[2] Camera opened successfully!")
 print(f"    Resolution: {int(cap.get(3))}x{int(cap.get(4))}")
 
@@ -22,12 +42,21 @@ cv2.namedWindow("Test Preview", cv2.WINDOW_NORMAL)
 print("[4] Starting preview loop (press 'q' to quit)...")
 print()
 
+retry_delay = 0.05
+next_frame_time = time.monotonic()
+
 while True:
     ret, frame = cap.read()
     if not ret:
+        # Back off while the camera is unavailable instead of retrying at a fixed rate;
+        # waitKey does the waiting so 'q' still works meanwhile
         print("Failed to read frame")
-        time.sleep(0.1)
+        if cv2.waitKey(int(retry_delay * 1000)) & 0xFF == ord('q'):
+            break
+        retry_delay = min(retry_delay * 2, 2.0)
+        next_frame_time = time.monotonic()
         continue
+    retry_delay = 0.05
     
     # Add text overlay
     cv2.putText(frame, "Press 'q' to quit", (10, 30), 
@@ -35,9 +64,17 @@ while True:
     
     cv2.imshow("Test Preview", frame)
     
-    key = cv2.waitKey(1) & 0xFF
+    key = poll_key() & 0xFF
     if key == ord('q'):
         break
+    
+    # Sleep off whatever is left of this frame's time slot
+    next_frame_time += frame_interval
+    delay = next_frame_time - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+    else:
+        next_frame_time = time.monotonic()
 
 print("\n[5] Cleaning up...")
 cap.release()
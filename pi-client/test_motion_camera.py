@@ -1,20 +1,58 @@
 """
 Combined Test: Motion-Triggered Camera Capture
 
-This script demonstrates the motion sensor and camera working together.
-When motion is detected, it captures a snapshot.
+This script demonstrates camera motion detection and snapshots working
+together on a single camera. When motion is detected, it captures a snapshot.
 """
 
 import sys
 import time
 import os
+import selectors
 
 # Add parent to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from doorcam.motion_sensor import MotionSensor
+from doorcam.camera_motion import CameraMotionDetector
 from doorcam.camera_manager import CameraManager
 
+# How often to print a status line while waiting for commands
+STATS_INTERVAL_SEC = 60
+
+
+def read_commands(on_idle):
+    """
+    Yield commands typed on stdin until EOF.
+    
+    stdin is watched with a selector, so on_idle() runs about once a second
+    while waiting instead of the main thread sitting in input(). Windows
+    can't select() on stdin, so there it falls back to input() and on_idle()
+    never runs.
+    
+    Args:
+        on_idle: Called each second no command arrives
+    """
+    if os.name == "nt":
+        while True:
+            try:
+                yield input("> ")
+            except EOFError:
+                return
+    
+    sel = selectors.DefaultSelector()
+    sel.register(sys.stdin, selectors.EVENT_READ)
+    try:
+        while True:
+            print("> ", end="", flush=True)
+            while not sel.select(timeout=1.0):
+                on_idle()
+            line = sys.stdin.readline()
+            if not line:
+                return
+            yield line
+    finally:
+        sel.close()
+
 
 def main():
     print("=" * 60)
@@ -36,9 +74,9 @@ def main():
         camera.capture_snapshot(filename)
         print(f"*** Saved: {filename} ***\n")
     
-    # Initialize motion sensor (mock mode for testing)
-    sensor = MotionSensor(callback=on_motion, mock_mode=True)
-    sensor.start()
+    # Detect motion on the same camera, so the device is only opened once
+    detector = CameraMotionDetector(callback=on_motion, camera=camera)
+    detector.start()
     
     print("System ready!")
     print()
@@ -49,30 +87,44 @@ def main():
     print("  Type 'quit' - Exit")
     print()
     
+    next_stats = time.monotonic() + STATS_INTERVAL_SEC
+    
+    def print_periodic_stats():
+        nonlocal next_stats
+        if time.monotonic() < next_stats:
+            return
+        next_stats += STATS_INTERVAL_SEC
+        stats = detector.get_stats()
+        print(f"\n[Stats] Triggers: {stats['trigger_count']}, frames: {stats['frames_processed']}")
+        print("> ", end="", flush=True)
+    
     try:
-        while True:
-            cmd = input("> ").strip().lower()
+        for line in read_commands(print_periodic_stats):
+            cmd = line.strip().lower()
             
             if cmd == "quit" or cmd == "q":
                 break
             elif cmd == "preview" or cmd == "p":
                 print("Opening preview (press 'q' in window to close)...")
+                # Pause detection so the preview gets every frame
+                detector.stop()
                 camera.run_preview_blocking()
                 # Reopen camera after preview closes
                 camera.open()
+                detector.start()
             elif cmd == "stats":
-                print("\nMotion Sensor:", sensor.get_stats())
+                print("\nMotion Detector:", detector.get_stats())
                 print("Camera:", camera.get_stats())
                 print()
             else:
                 # Simulate motion on Enter
-                sensor.simulate_motion()
+                on_motion()
     
     except KeyboardInterrupt:
         print("\nInterrupted")
     finally:
         print("\nShutting down...")
-        sensor.stop()
+        detector.stop()
         camera.close()
         print("Done!")
 
@@ -1,22 +1,58 @@
 """Test USB webcam (Camera 1)"""
 import cv2
+import sys
+import time
 
 print("Opening USB webcam (Camera 1)...")
-cap = cv2.VideoCapture(1)
+# V4L2 directly on Linux (the Pi); the default backend elsewhere
+if sys.platform.startswith("linux"):
+    cap = cv2.VideoCapture(1, cv2.CAP_V4L2)
+else:
+    cap = cv2.VideoCapture(1)
 
 if not cap.isOpened():
     print("ERROR: USB webcam not found!")
     exit(1)
 
+# Compressed 640x480 capture with a single queued frame
+cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+# Preview at 15 fps; pollKey (OpenCV >= 4.5) avoids waitKey's 1 ms sleep
+TARGET_FPS = 15
+cap.set(cv2.CAP_PROP_FPS, TARGET_FPS)
+frame_interval = 1.0 / TARGET_FPS
+poll_key = cv2.pollKey if hasattr(cv2, "pollKey") else (lambda: cv2.waitKey(1))
+
 print("USB Webcam preview - press 'q' to quit")
 cv2.namedWindow("USB Webcam", cv2.WINDOW_NORMAL)
 
+retry_delay = 0.05
+next_frame_time = time.monotonic()
+
 while True:
     ret, frame = cap.read()
-    if ret:
-        cv2.imshow("USB Webcam", frame)
-    if cv2.waitKey(1) & 0xFF == ord('q'):
+    if not ret:
+        # Back off while the camera is unavailable (waitKey keeps 'q' working)
+        if cv2.waitKey(int(retry_delay * 1000)) & 0xFF == ord('q'):
+            break
+        retry_delay = min(retry_delay * 2, 2.0)
+        next_frame_time = time.monotonic()
+        continue
+    retry_delay = 0.05
+    
+    cv2.imshow("USB Webcam", frame)
+    if poll_key() & 0xFF == ord('q'):
         break
+    
+    next_frame_time += frame_interval
+    delay = next_frame_time - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+    else:
+        next_frame_time = time.monotonic()
 
 cap.release()
 cv2.destroyAllWindows()